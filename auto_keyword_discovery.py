@@ -5,22 +5,141 @@
 
 import requests
 import urllib3
-from typing import List, Dict, Set
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Set, Optional
 import json
+import hashlib
+import logging
+import heapq
+import os
 from pathlib import Path
+import random
 import re
+import shutil
+import tempfile
+import threading
+import time
 from collections import Counter
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 # SSL 경고 비활성화
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# 동시 검색 요청 수 (I/O 대기 시간을 겹쳐서 전체 수집 시간 단축)
+SEARCH_MAX_WORKERS = 8
+
+# 검색 결과 디스크 캐시 (TTL 내 재실행 시 API 호출 생략, 0이면 비활성화)
+SEARCH_CACHE_DIR = Path("./.cache/naver")
+SEARCH_CACHE_TTL = 6 * 60 * 60  # 6시간
+
+# 의미있는 단어 패턴 (한글 2자 이상, 영문 3자 이상)
+_WORD_RE = re.compile(r'[가-힣]{2,}|[A-Za-z]{3,}')
+
+class _JitterRetry(Retry):
+    """지수 백오프에 무작위 지연을 더한 Retry (동시 재시도가 같은 시점에 몰리지 않도록)"""
+    
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return backoff
+        return backoff + random.uniform(0, self.backoff_factor)
+
+
+# HTTP 세션 재사용 (Keep-Alive로 TLS 핸드셰이크 비용 절감)
+# 풀 크기는 동시 검색 스레드 수 이상이어야 연결이 버려지지 않음
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=_JitterRetry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+            respect_retry_after_header=True  # 429 응답의 Retry-After 준수
+        )
+    )
+)
+
+
+class _TokenBucket:
+    """스레드 안전 토큰 버킷 (초당 요청 수 제한)"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                wait = (1 - self.tokens) / self.rate
+            
+            time.sleep(wait)
+
+
+# 네이버 검색 API 호출 속도 제한 (초당 10회, 429 응답 방지)
+_RATE_LIMITER = _TokenBucket(rate=10, capacity=10)
+
+
+def _search_cache_path(query: str, display: int, sort: str) -> Path:
+    """검색 조건별 캐시 파일 경로"""
+    key = json.dumps([query, display, sort], ensure_ascii=False)
+    return SEARCH_CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+
+def _load_cached_search(cache_path: Path):
+    """TTL 이내의 캐시된 검색 결과 로드 (없거나 만료되면 None)"""
+    try:
+        if time.time() - cache_path.stat().st_mtime > SEARCH_CACHE_TTL:
+            return None
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_search(cache_path: Path, data: Dict):
+    """검색 결과를 캐시에 저장 (임시 파일 작성 후 교체)"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("⚠️ 검색 캐시 저장 실패: %s", e)
+
 
 def naver_shopping_search(
     query: str,
     client_id: str,
     client_secret: str,
     display: int = 100,
-    sort: str = "sim"
+    sort: str = "sim",
+    force_refresh: bool = False
 ) -> Dict:
     """
     네이버 쇼핑 검색 API
@@ -31,10 +150,17 @@ def naver_shopping_search(
         client_secret: API Client Secret
         display: 결과 개수 (최대 100)
         sort: 정렬 (sim:유사도, date:날짜, asc:가격오름차순, dsc:가격내림차순)
+        force_refresh: True면 캐시를 무시하고 새로 조회 (결과는 캐시에 갱신)
     
     Returns:
         API 응답
     """
+    cache_path = _search_cache_path(query, display, sort)
+    if SEARCH_CACHE_TTL > 0 and not force_refresh:
+        cached = _load_cached_search(cache_path)
+        if cached is not None:
+            return cached
+    
     url = "https://openapi.naver.com/v1/search/shop.json"
     
     headers = {
@@ -49,61 +175,211 @@ def naver_shopping_search(
     }
     
     try:
-        response = requests.get(
+        _RATE_LIMITER.acquire()
+        response = _SESSION.get(
             url,
             headers=headers,
             params=params,
-            timeout=30,
+            timeout=(5, 30),  # (연결, 응답) - 연결 불가 호스트는 빠르게 포기
             verify=False
         )
         response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"❌ 검색 실패 ({query}): {str(e)}")
+        data = orjson.loads(response.content) if orjson is not None else response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        # 재시도 후에도 실패한 검색어만 건너뜀 (나머지 카테고리 수집은 계속)
+        logger.warning("❌ 검색 실패 (%s): %s", query, e)
         return {"items": []}
+    
+    if SEARCH_CACHE_TTL > 0:
+        _save_cached_search(cache_path, data)
+    
+    return data
+
+
+# 키워드 추출에 사용하는 제품 필드
+_PRODUCT_FIELDS = ("title", "brand", "productId", "link")
+
+
+def _search_products(
+    query: str,
+    client_id: str,
+    client_secret: str,
+    display: int = 100,
+    sort: str = "sim",
+    force_refresh: bool = False
+) -> List[Dict]:
+    """
+    검색 결과에서 키워드 추출에 필요한 필드만 남긴 제품 목록 반환
+    
+    동시 요청 결과가 소비될 때까지 전체 응답 대신 작은 dict만 메모리에 유지
+    """
+    data = naver_shopping_search(
+        query=query,
+        client_id=client_id,
+        client_secret=client_secret,
+        display=display,
+        sort=sort,
+        force_refresh=force_refresh
+    )
+    return [
+        {field: item[field] for field in _PRODUCT_FIELDS if field in item}
+        for item in data.get("items") or ()
+    ]
+
+
+def _strip_tags(text: str) -> str:
+    """
+    HTML 태그 제거 (정규식 대신 str.find 스캔)
+    
+    r'<[^>]+>' 치환과 같은 결과를 내며, 태그가 없는 문자열은 그대로 반환
+    """
+    if '<' not in text:
+        return text
+    
+    # 네이버 검색 결과의 태그는 대부분 강조 태그(<b>, </b>)뿐이므로
+    # 모든 '<'가 강조 태그의 시작이면 C 레벨 replace로 한 번에 제거
+    if text.count('<') == text.count('<b>') + text.count('</b>'):
+        return text.replace('<b>', '').replace('</b>', '')
+    
+    parts = []
+    pos = 0
+    search = 0
+    while True:
+        lt = text.find('<', search)
+        if lt < 0:
+            break
+        gt = text.find('>', lt + 1)
+        if gt < 0:
+            break
+        if gt == lt + 1:
+            # 빈 꺾쇠 "<>"는 태그가 아님
+            search = gt + 1
+            continue
+        parts.append(text[pos:lt])
+        pos = search = gt + 1
+    
+    parts.append(text[pos:])
+    return ''.join(parts)
 
 
-def extract_keywords_from_products(products: List[Dict], min_freq: int = 2) -> List[str]:
+def extract_keywords_from_products(
+    products: List[Dict],
+    min_freq: int = 2,
+    max_keywords: Optional[int] = None
+) -> List[str]:
     """
     제품 데이터에서 키워드 추출
     
     Args:
         products: 제품 목록
         min_freq: 최소 빈도 (이 횟수 이상 등장한 단어만)
+        max_keywords: 최대 키워드 수 (None이면 전체)
     
     Returns:
-        키워드 리스트
+        키워드 리스트 (빈도 내림차순, 동률은 가나다순)
     """
-    keywords = []
-    brands = set()
+    brand_freq = Counter()
+    brand_cache = {}  # 원본 브랜드 → 정리된 브랜드 (같은 판매자 반복 시 재계산 생략)
+    titles = []
     
     for product in products:
-        title = product.get("title", "")
-        brand = product.get("brand", "")
+        raw_brand = product.get("brand", "")
         
         # HTML 태그 제거
-        title = re.sub(r'<[^>]+>', '', title)
-        brand = re.sub(r'<[^>]+>', '', brand)
+        titles.append(_strip_tags(product.get("title", "")))
+        brand = brand_cache.get(raw_brand)
+        if brand is None:
+            brand = _strip_tags(raw_brand).strip()
+            brand_cache[raw_brand] = brand
         
         # 브랜드명 수집
-        if brand and len(brand) >= 2:
-            brands.add(brand.strip())
-        
-        # 제목에서 의미있는 단어 추출
-        # 한글 2자 이상, 영문 3자 이상
-        words = re.findall(r'[가-힣]{2,}|[A-Za-z]{3,}', title)
-        keywords.extend(words)
+        if len(brand) >= 2:
+            brand_freq[brand] += 1
+    
+    # 제목에서 의미있는 단어 추출 (한글 2자 이상, 영문 3자 이상)
+    # - 태그는 매칭 전에 제거해야 강조 태그로 나뉜 단어가 유지됨 ("<b>여성</b>의류" → "여성의류")
+    # - 전체 제목을 줄바꿈으로 이어 정규식을 한 번만 실행 (줄바꿈은 단어 패턴에 매칭되지 않음)
+    word_freq = Counter(_WORD_RE.findall("\n".join(titles)))
+    
+    # 자주 등장하는 단어 (빈도순으로 순회하다 min_freq 미만이면 중단) + 모든 브랜드
+    keyword_freq = {}
+    for word, freq in word_freq.most_common():
+        if freq < min_freq:
+            break
+        keyword_freq[word] = freq
+    for brand, freq in brand_freq.items():
+        keyword_freq[brand] = max(freq, word_freq[brand])
+    
+    # 빈도순 정렬 (상위 N개만 필요하면 전체 정렬 대신 힙으로 선택)
+    sort_key = lambda kw: (-keyword_freq[kw], kw)
+    if max_keywords is not None:
+        return heapq.nsmallest(max_keywords, keyword_freq, key=sort_key)
+    return sorted(keyword_freq, key=sort_key)
+
+
+def _extend_unique_products(all_products: List[Dict], seen_ids: Set[str], items: List[Dict]) -> None:
+    """검색어 간 중복 제품(productId, 없으면 link 기준)을 제외하고 추가"""
+    for item in items:
+        product_id = item.get("productId") or item.get("link")
+        if product_id:
+            if product_id in seen_ids:
+                continue
+            seen_ids.add(product_id)
+        all_products.append(item)
+
+
+def _submit_searches(
+    executor: ThreadPoolExecutor,
+    queries: List[str],
+    client_id: str,
+    client_secret: str,
+    display: int,
+    force_refresh: bool = False
+) -> List[Future]:
+    """검색어별 제품 검색을 스레드 풀에 제출"""
+    return [
+        executor.submit(
+            _search_products,
+            query=query,
+            client_id=client_id,
+            client_secret=client_secret,
+            display=display,
+            sort="sim",  # 인기순
+            force_refresh=force_refresh
+        )
+        for query in queries
+    ]
+
+
+def _collect_products(queries: List[str], futures: List[Future]) -> List[Dict]:
+    """
+    검색 결과를 검색어 순서대로 모아 중복 제거한 제품 목록 반환
     
-    # 빈도 분석
-    word_freq = Counter(keywords)
+    Args:
+        queries: 검색어 리스트
+        futures: _submit_searches 결과
+    """
+    all_products = []
+    seen_ids = set()
     
-    # 자주 등장하는 단어 + 모든 브랜드
-    frequent_words = [word for word, freq in word_freq.items() if freq >= min_freq]
+    for query, future in zip(queries, futures):
+        items = future.result()
+        _extend_unique_products(all_products, seen_ids, items)
+        logger.debug("검색: %s ✓ %d개", query, len(items))
     
-    # 중복 제거 및 정렬
-    all_keywords = list(set(frequent_words) | brands)
+    return all_products
+
+
+def _flatten_seed_queries(categories: Dict) -> Dict[str, List[str]]:
+    """
+    계층적 시드 검색어(SEED_QUERIES)를 {카테고리명: [대분류 검색어]}로 변환
     
-    return sorted(all_keywords)
+    이미 평면 구조인 카테고리는 그대로 사용
+    """
+    return {
+        category: cat_data.get("대분류", []) if isinstance(cat_data, dict) else cat_data
+        for category, cat_data in categories.items()
+    }
 
 
 def discover_trending_keywords_hierarchical(
@@ -112,7 +388,9 @@ def discover_trending_keywords_hierarchical(
     categories: Dict,
     max_keywords_per_category: int = 30,
     manager = None,
-    progress_callback = None
+    progress_callback = None,
+    max_workers: int = SEARCH_MAX_WORKERS,
+    force_refresh: bool = False
 ) -> Dict:
     """
     계층적 카테고리별 트렌딩 키워드 자동 발견
@@ -124,6 +402,8 @@ def discover_trending_keywords_hierarchical(
         max_keywords_per_category: 카테고리당 최대 키워드 수
         manager: CategoryManager 인스턴스 (선택사항, 없으면 새로 생성)
         progress_callback: 진행 상황 콜백 함수 (current, total, message)
+        max_workers: 동시 검색 요청 수
+        force_refresh: True면 검색 캐시를 무시하고 새로 조회
     
     Returns:
         계층적 구조의 키워드
@@ -147,70 +427,65 @@ def discover_trending_keywords_hierarchical(
     
     current_task = 0
     
-    for major_category, cat_data in categories.items():
-        print(f"\n📦 {major_category}")
-        
-        # 대분류 키워드 수집
-        if "대분류" in cat_data:
-            current_task += 1
-            if progress_callback:
-                progress_callback(current_task, total_tasks, f"📦 {major_category} (대분류)")
-            
-            print(f"  🏢 대분류 키워드 수집...")
-            all_products = []
-            
-            for query in cat_data["대분류"]:
-                print(f"    검색: {query}...", end=" ")
-                data = naver_shopping_search(
-                    query=query,
-                    client_id=client_id,
-                    client_secret=client_secret,
-                    display=100,
-                    sort="sim"
+    # 모든 카테고리 업데이트 후 한 번만 저장 (batch 블록 종료 시)
+    with manager.batch(), ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 모든 검색 요청을 미리 제출 (결과는 카테고리 순서대로 소비)
+        major_futures = {}
+        sub_futures = {}
+        for major_category, cat_data in categories.items():
+            major_futures[major_category] = _submit_searches(
+                executor, cat_data.get("대분류", []), client_id, client_secret,
+                display=100, force_refresh=force_refresh
+            )
+            for sub_category, search_queries in cat_data.get("중분류", {}).items():
+                sub_futures[(major_category, sub_category)] = _submit_searches(
+                    executor, search_queries, client_id, client_secret,
+                    display=50, force_refresh=force_refresh
                 )
-                items = data.get("items", [])
-                all_products.extend(items)
-                print(f"✓ {len(items)}개")
-            
-            keywords = extract_keywords_from_products(all_products, min_freq=3)
-            keywords = keywords[:max_keywords_per_category]
-            
-            # 대분류에 저장
-            manager.update_auto_keywords(major_category, keywords, sub=None)
-            
-            print(f"    ✅ 대분류: {len(keywords)}개 키워드")
-            print(f"       예: {', '.join(keywords[:5])}")
         
-        # 중분류 키워드 수집
-        if "중분류" in cat_data and cat_data["중분류"]:
-            print(f"  📁 중분류 키워드 수집...")
+        for major_category, cat_data in categories.items():
+            print(f"\n📦 {major_category}")
             
-            for sub_category, search_queries in cat_data["중분류"].items():
+            # 대분류 키워드 수집
+            if "대분류" in cat_data:
                 current_task += 1
                 if progress_callback:
-                    progress_callback(current_task, total_tasks, f"📁 {major_category} > {sub_category}")
+                    progress_callback(current_task, total_tasks, f"📦 {major_category} (대분류)")
                 
-                print(f"    └─ {sub_category}:", end=" ")
+                print(f"  🏢 대분류 키워드 수집...")
+                all_products = _collect_products(cat_data["대분류"], major_futures[major_category])
                 
-                all_products = []
-                for query in search_queries:
-                    data = naver_shopping_search(
-                        query=query,
-                        client_id=client_id,
-                        client_secret=client_secret,
-                        display=50,
-                        sort="sim"
-                    )
-                    items = data.get("items", [])
-                    all_products.extend(items)
+                keywords = extract_keywords_from_products(
+                    all_products, min_freq=3, max_keywords=max_keywords_per_category
+                )
                 
-                keywords = extract_keywords_from_products(all_products, min_freq=2)
-                keywords = keywords[:max_keywords_per_category]
+                # 대분류에 저장
+                manager.update_auto_keywords(major_category, keywords, sub=None)
                 
-                # 중분류에 저장
-                manager.update_auto_keywords(major_category, keywords, sub=sub_category)
+                print(f"    ✅ 대분류: {len(keywords)}개 키워드")
+                print(f"       예: {', '.join(keywords[:5])}")
+            
+            # 중분류 키워드 수집
+            if "중분류" in cat_data and cat_data["중분류"]:
+                print(f"  📁 중분류 키워드 수집...")
                 
-                print(f" ✓ {len(keywords)}개 ({', '.join(keywords[:3])}...)")
+                for sub_category, search_queries in cat_data["중분류"].items():
+                    current_task += 1
+                    if progress_callback:
+                        progress_callback(current_task, total_tasks, f"📁 {major_category} > {sub_category}")
+                    
+                    all_products = _collect_products(
+                        search_queries, sub_futures[(major_category, sub_category)]
+                    )
+                    
+                    keywords = extract_keywords_from_products(
+                        all_products, min_freq=2, max_keywords=max_keywords_per_category
+                    )
+                    
+                    # 중분류에 저장
+                    manager.update_auto_keywords(major_category, keywords, sub=sub_category)
+                    
+                    print(f"    └─ {sub_category}: ✓ {len(keywords)}개 ({', '.join(keywords[:3])}...)")
     
     print(f"\n{'='*70}")
     print(f"✅ 수집 완료!")
@@ -222,8 +497,10 @@ def discover_trending_keywords_hierarchical(
 def discover_trending_keywords(
     client_id: str,
     client_secret: str,
-    categories: Dict[str, List[str]],
-    max_keywords_per_category: int = 30
+    categories: Dict,
+    max_keywords_per_category: int = 30,
+    max_workers: int = SEARCH_MAX_WORKERS,
+    force_refresh: bool = False
 ) -> Dict[str, List[str]]:
     """
     카테고리별 트렌딩 키워드 자동 발견 (하위 호환성)
@@ -231,53 +508,64 @@ def discover_trending_keywords(
     Args:
         client_id: API Client ID
         client_secret: API Client Secret
-        categories: {카테고리명: [검색어 리스트]}
+        categories: {카테고리명: [검색어 리스트]} 또는 계층적 카테고리 구조
         max_keywords_per_category: 카테고리당 최대 키워드 수
+        max_workers: 동시 검색 요청 수
+        force_refresh: True면 검색 캐시를 무시하고 새로 조회
     
     Returns:
         {카테고리명: [자동 발견된 키워드]}
     """
     discovered = {}
+    categories = _flatten_seed_queries(categories)
     
     print("="*70)
     print("🔍 실시간 트렌드 키워드 자동 발견")
     print("="*70)
     
-    for category, search_queries in categories.items():
-        print(f"\n📦 {category}")
-        
-        all_products = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 모든 검색 요청을 미리 제출 (결과는 카테고리 순서대로 소비)
+        futures = {
+            category: _submit_searches(
+                executor, search_queries, client_id, client_secret,
+                display=100, force_refresh=force_refresh
+            )
+            for category, search_queries in categories.items()
+        }
         
-        # 각 검색어로 제품 수집
-        for query in search_queries:
-            print(f"  검색: {query}...", end=" ")
+        for category, search_queries in categories.items():
+            print(f"\n📦 {category}")
             
-            data = naver_shopping_search(
-                query=query,
-                client_id=client_id,
-                client_secret=client_secret,
-                display=100,
-                sort="sim"  # 인기순
+            # 각 검색어로 제품 수집
+            all_products = _collect_products(search_queries, futures[category])
+            
+            # 키워드 추출 (상위 N개만)
+            keywords = extract_keywords_from_products(
+                all_products, min_freq=3, max_keywords=max_keywords_per_category
             )
             
-            items = data.get("items", [])
-            all_products.extend(items)
-            print(f"✓ {len(items)}개")
-        
-        # 키워드 추출
-        keywords = extract_keywords_from_products(all_products, min_freq=3)
-        
-        # 상위 N개만
-        keywords = keywords[:max_keywords_per_category]
-        
-        discovered[category] = keywords
-        
-        print(f"  ✅ 발견: {len(keywords)}개 키워드")
-        print(f"     예: {', '.join(keywords[:5])}")
+            discovered[category] = keywords
+            
+            print(f"  ✅ 발견: {len(keywords)}개 키워드")
+            print(f"     예: {', '.join(keywords[:5])}")
     
     return discovered
 
 
+@lru_cache(maxsize=4)
+def _load_keyword_file(path: str, mtime_ns: int) -> Dict:
+    """
+    키워드 JSON 파일 로드 (경로 + 수정시각 기준 캐시)
+    
+    파일이 바뀌면 mtime_ns가 달라져 자동으로 다시 읽음.
+    반환된 dict는 캐시와 공유되므로 수정하지 말 것.
+    """
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 def merge_with_existing_keywords(
     discovered: Dict[str, List[str]],
     existing_file: str = "./naver_categories.json",
@@ -300,9 +588,8 @@ def merge_with_existing_keywords(
     
     if existing_path.exists():
         try:
-            with open(existing_path, "r", encoding="utf-8") as f:
-                existing = json.load(f)
-            print(f"\n📦 기존 데이터: {len(existing)}개 카테고리, {sum(len(v) for v in existing.values())}개 키워드")
+            existing = _load_keyword_file(str(existing_path), existing_path.stat().st_mtime_ns)
+            print(f"\n📦 기존 데이터: {len(existing)}개 카테고리, {sum(map(len, existing.values()))}개 키워드")
         except:
             pass
     
@@ -312,19 +599,19 @@ def merge_with_existing_keywords(
         # 병합 모드: 기존 + 신규 (누적)
         print("🔄 모드: 병합 (기존 키워드 유지 + 신규 추가)")
         
-        for category in set(list(existing.keys()) + list(discovered.keys())):
+        for category in existing.keys() | discovered.keys():
             old_keywords = set(existing.get(category, []))
             new_keywords = set(discovered.get(category, []))
             
             # 합치기
-            merged[category] = sorted(list(old_keywords | new_keywords))
+            merged[category] = sorted(old_keywords | new_keywords)
     
     else:  # mode == "replace"
         # 교체 모드: 신규로만 교체 (최신 인기 키워드만 유지)
         print("🔄 모드: 교체 (최신 인기 키워드만 유지)")
         merged = discovered
     
-    print(f"✅ 결과: {len(merged)}개 카테고리, {sum(len(v) for v in merged.values())}개 키워드")
+    print(f"✅ 결과: {len(merged)}개 카테고리, {sum(map(len, merged.values()))}개 키워드")
     
     return merged
 
@@ -344,21 +631,51 @@ def save_keywords(
     """
     save_path = Path(save_path)
     
-    # 백업 생성
-    if backup and save_path.exists():
-        import shutil
-        from datetime import datetime
-        backup_name = f"{save_path.stem}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        backup_path = save_path.parent / backup_name
-        shutil.copy(save_path, backup_path)
-        print(f"📦 백업: {backup_path}")
+    # 임시 파일에 먼저 저장 (쓰기 도중 실패해도 기존 파일 보존)
+    # 이름이 겹치지 않는 임시 파일을 써서 동시에 저장해도 서로의 임시 파일을 덮어쓰지 않음
+    with tempfile.NamedTemporaryFile(
+        dir=save_path.parent, prefix=f"{save_path.name}.", suffix=".tmp", delete=False
+    ) as f:
+        tmp_path = Path(f.name)
+        try:
+            if orjson is not None:
+                f.write(orjson.dumps(keywords, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+            else:
+                f.write((json.dumps(keywords, ensure_ascii=False, indent=2) + "\n").encode("utf-8"))
+        except Exception:
+            # 반쯤 쓰인 임시 파일은 남기지 않음
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
     
-    # 저장
-    with open(save_path, "w", encoding="utf-8") as f:
-        json.dump(keywords, f, ensure_ascii=False, indent=2)
+    try:
+        # 백업 생성 (복사 대신 하드 링크, 기존 파일 경로가 비는 순간 없음)
+        if backup and save_path.exists():
+            from datetime import datetime
+            backup_name = f"{save_path.stem}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            backup_path = save_path.parent / backup_name
+            try:
+                # 같은 초에 두 번 저장하면 같은 이름이므로 먼저 지움
+                backup_path.unlink(missing_ok=True)
+                os.link(save_path, backup_path)
+            except OSError:
+                # 하드 링크를 지원하지 않는 파일시스템이면 복사, 그것도 안 되면 백업 없이 저장
+                try:
+                    shutil.copy2(save_path, backup_path)
+                except OSError as e:
+                    print(f"⚠️ 백업 실패 (저장은 계속): {e}")
+                    backup_path = None
+            if backup_path is not None:
+                print(f"📦 백업: {backup_path}")
+        
+        # 저장 (원자적 교체)
+        os.replace(tmp_path, save_path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
     
     print(f"✅ 저장: {save_path}")
-    print(f"   총 {len(keywords)}개 카테고리, {sum(len(v) for v in keywords.values())}개 키워드")
+    print(f"   총 {len(keywords)}개 카테고리, {sum(map(len, keywords.values()))}개 키워드")
 
 
 # 카테고리별 시드 검색어 (실제 네이버 쇼핑 카테고리 구조 기반)
@@ -562,11 +879,14 @@ SEED_QUERIES = {
 
 
 if __name__ == "__main__":
-    import os
+    import sys
     
     CLIENT_ID = os.getenv("NAVER_CLIENT_ID", "9LKTOG5R9F8Yx74PnZe0")
     CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET", "gytCGuuEeX")
     
+    # --no-cache: 캐시를 무시하고 모든 검색어를 새로 조회
+    force_refresh = "--no-cache" in sys.argv
+    
     print("🚀 자동 키워드 발견 시작\n")
     
     # 1. 트렌딩 키워드 발견
@@ -574,7 +894,8 @@ if __name__ == "__main__":
         client_id=CLIENT_ID,
         client_secret=CLIENT_SECRET,
         categories=SEED_QUERIES,
-        max_keywords_per_category=50
+        max_keywords_per_category=50,
+        force_refresh=force_refresh
     )
     
     print(f"\n{'='*70}")
@@ -4,10 +4,135 @@
 - 자동 키워드 + 사용자 지정 키워드 관리
 """
 
+import hashlib
 import json
+import mmap
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Optional, Set
-from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+# 카테고리 구조의 기준 (모듈 로드 시 한 번만 import, 실패해도 기본 구조로 동작)
+try:
+    from auto_keyword_discovery import SEED_QUERIES
+    _SEED_IMPORT_ERROR = None
+except Exception as e:
+    SEED_QUERIES = None
+    _SEED_IMPORT_ERROR = e
+
+
+# 백업 정책: BACKUP_EVERY번 저장할 때마다 한 번, 최대 MAX_BACKUPS개 슬롯을 돌려 씀
+BACKUP_EVERY = 10
+MAX_BACKUPS = 3
+
+# 이 크기 이상의 파일은 mmap으로 읽음 (작은 파일은 mmap 설정 비용이 더 큼)
+MMAP_MIN_SIZE = 4096
+
+# 단일 키워드 변경은 저널 파일에 한 줄씩 추가하고, 이 횟수마다 전체 파일로 압축
+JOURNAL_COMPACT_EVERY = 100
+
+# 파일에 저장되는 SEED_QUERIES 구조 서명 키 (카테고리 데이터와 구분, 로드 시 분리)
+SEED_SIG_KEY = "__seed_sig__"
+
+
+# SEED_QUERIES를 불러올 수 없을 때 사용하는 기본 구조 (대분류, 중분류들)
+_FALLBACK_STRUCTURE = (
+    ("패션의류", ("여성의류", "남성의류", "언더웨어")),
+    ("화장품/미용", ("스킨케어", "메이크업", "향수")),
+)
+
+
+def _new_bucket(major: bool = False) -> Dict:
+    """빈 카테고리 노드 생성 (대분류는 subcategories 포함)"""
+    bucket = {
+        "auto_keywords": [],
+        "user_keywords": [],
+        "enabled_keywords": []
+    }
+    if major:
+        bucket["subcategories"] = {}
+    return bucket
+
+
+def _read_json(path: Path) -> Dict:
+    """
+    JSON 파일 로드 (orjson 우선)
+    
+    orjson 사용 시 큰 파일은 mmap으로 페이지 캐시에서 바로 파싱 (중간 bytes 복사 생략)
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                return orjson.loads(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+    # 표준 json도 bytes(UTF-8)를 바로 파싱 (텍스트 모드 디코딩 단계 생략)
+    return json.loads(path.read_bytes())
+
+
+def _dump_json(data: Dict, pretty: bool = False) -> bytes:
+    """
+    JSON 직렬화 (orjson 우선)
+    
+    Args:
+        data: 저장할 데이터
+        pretty: True면 들여쓰기 2칸 (사람이 읽는 용도), 기본은 공백 없는 압축 형식
+    """
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+    if pretty:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return (text + "\n").encode("utf-8")
+
+
+def _write_json(path: Path, data: Dict, pretty: bool = False) -> None:
+    """JSON 파일 저장 (형식은 _dump_json 참고)"""
+    path.write_bytes(_dump_json(data, pretty=pretty))
+
+
+def _write_temp(path: Path, payload: bytes) -> Path:
+    """
+    path와 같은 폴더의 임시 파일에 payload 저장
+    
+    이름이 겹치지 않는 임시 파일을 쓰므로 여러 세션이 동시에 저장해도
+    서로의 임시 파일을 덮어쓰지 않음. 쓰기에 실패하면 임시 파일을 지우고 예외 발생.
+    
+    Returns:
+        임시 파일 경로 (os.replace로 path에 교체해서 사용)
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+    ) as f:
+        tmp_path = Path(f.name)
+        try:
+            f.write(payload)
+        except Exception:
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+    return tmp_path
+
+
+def _write_json_atomic(path: Path, data: Dict) -> None:
+    """임시 파일에 쓴 뒤 교체하는 JSON 저장 (중단돼도 기존 파일이 깨지지 않음)"""
+    tmp_path = _write_temp(path, _dump_json(data))
+    try:
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 class CategoryManager:
@@ -15,58 +140,142 @@ class CategoryManager:
     
     def __init__(self, data_path: str = "./categories_hierarchical.json"):
         self.data_path = Path(data_path)
+        self._seed_sig = None    # 마지막으로 병합한 SEED_QUERIES 구조 서명
         self.data = self._load_or_init()
+        self._index = self._build_index()
+        self._dirty = False      # 저장되지 않은 변경 존재 여부
+        self._in_batch = False   # batch() 블록 안에서는 저장을 미룸
+        self._save_count = 0
+        self._last_hash = None   # 마지막으로 저장한 내용의 해시 (같으면 쓰기 생략)
+        self._version = 0        # 변경마다 증가 (대분류 집계 캐시 무효화용)
+        self._agg_cache = {}     # (대분류, 종류) -> (버전, 대분류+중분류 병합 키워드)
+        self._journal_path = self.data_path.with_suffix(".journal.jsonl")
+        self._journal_ops = self._replay_journal()  # 마지막 저장 이후 저널에 쌓인 변경 수
+    
+    @property
+    def version(self) -> int:
+        """변경 횟수 (화면 쪽 캐시를 변경 시점에 무효화하는 용도)"""
+        return self._version
+    
+    def _build_index(self) -> Dict[Tuple[str, Optional[str]], Dict[str, Set[str]]]:
+        """
+        키워드 멤버십 인덱스 생성
+        
+        (대분류, 중분류 또는 None)마다 auto/user/enabled 키워드 set을 유지해
+        중복·활성화 확인을 리스트 순회 대신 해시 조회로 처리 (리스트는 저장 순서 유지용)
+        """
+        index = {}
+        for major, major_data in self.data.items():
+            index[(major, None)] = self._index_entry_for(major_data)
+            for sub, sub_data in major_data["subcategories"].items():
+                index[(major, sub)] = self._index_entry_for(sub_data)
+        return index
+    
+    @staticmethod
+    def _index_entry_for(target: Dict) -> Dict[str, Set[str]]:
+        """카테고리 노드 하나의 키워드 set 생성"""
+        return {
+            "auto": set(target.get("auto_keywords", [])),
+            "user": set(target.get("user_keywords", [])),
+            "enabled": set(target.get("enabled_keywords", []))
+        }
+    
+    def _resolve(self, major: str, sub: Optional[str] = None) -> Optional[Tuple[Dict, Dict[str, Set[str]]]]:
+        """
+        카테고리 노드와 키워드 인덱스 조회
+        
+        Returns:
+            (노드 dict, 키워드 set 인덱스) 또는 대분류/중분류가 없으면 None
+        """
+        target = self.data.get(major)
+        if target is None:
+            return None
+        if not sub:
+            return target, self._index[(major, None)]
+        
+        target = target["subcategories"].get(sub)
+        if target is None:
+            return None
+        return target, self._index[(major, sub)]
     
     def _load_or_init(self) -> Dict:
         """데이터 로드 또는 초기화 (SEED_QUERIES와 병합)"""
         if self.data_path.exists():
-            with open(self.data_path, "r", encoding="utf-8") as f:
-                existing_data = json.load(f)
+            existing_data = _read_json(self.data_path)
+            stored_sig = existing_data.pop(SEED_SIG_KEY, None)
+            
+            # 대분류에는 항상 subcategories가 있도록 보정 (조회 시 .get 기본값 생략)
+            for major_data in existing_data.values():
+                major_data.setdefault("subcategories", {})
+            
+            # SEED_QUERIES 구조가 마지막 병합 이후 그대로면 전체 트리 비교 생략
+            seed_sig = self._seed_signature()
+            if seed_sig is not None and seed_sig == stored_sig:
+                self._seed_sig = seed_sig
+                return existing_data
             
             # SEED_QUERIES 구조와 병합 (새 카테고리 추가)
             updated_data = self._merge_with_seed_queries(existing_data)
             
-            # 새 카테고리가 추가되었으면 저장
-            if updated_data != existing_data:
-                print(f"🔄 새로운 카테고리 추가됨, 저장 중...")
-                with open(self.data_path, "w", encoding="utf-8") as f:
-                    json.dump(updated_data, f, ensure_ascii=False, indent=2)
+            # 서명이 바뀌었으면 저장 (다음 실행부터 병합 생략)
+            if seed_sig is not None:
+                print(f"🔄 카테고리 구조 변경 반영, 저장 중...")
+                self._seed_sig = seed_sig
+                _write_json_atomic(self.data_path, self._with_seed_sig(updated_data))
             
             return updated_data
         else:
+            self._seed_sig = self._seed_signature()
             return self._init_structure()
     
+    @staticmethod
+    def _seed_signature() -> Optional[str]:
+        """SEED_QUERIES의 (대분류, 중분류) 구조 해시 (import 실패 시 None)"""
+        if SEED_QUERIES is None:
+            return None
+        
+        seed_keys = [(major, "") for major in SEED_QUERIES]
+        seed_keys += [
+            (major, sub)
+            for major, cat_data in SEED_QUERIES.items()
+            for sub in (cat_data.get("중분류") or {})
+        ]
+        return hashlib.blake2b(repr(sorted(seed_keys)).encode(), digest_size=8).hexdigest()
+    
+    def _with_seed_sig(self, data: Dict) -> Dict:
+        """저장용 데이터 (SEED_QUERIES 서명 포함)"""
+        if self._seed_sig is None:
+            return data
+        return {**data, SEED_SIG_KEY: self._seed_sig}
+    
     def _merge_with_seed_queries(self, existing_data: Dict) -> Dict:
         """기존 데이터와 SEED_QUERIES 병합"""
         try:
-            from auto_keyword_discovery import SEED_QUERIES
+            if SEED_QUERIES is None:
+                raise ImportError(_SEED_IMPORT_ERROR)
+            
+            added_major = []
+            added_sub = []
             
             # SEED_QUERIES의 모든 카테고리 확인
             for major_cat, cat_data in SEED_QUERIES.items():
                 # 대분류가 없으면 추가
                 if major_cat not in existing_data:
-                    print(f"  ➕ 대분류 추가: {major_cat}")
-                    existing_data[major_cat] = {
-                        "auto_keywords": [],
-                        "user_keywords": [],
-                        "enabled_keywords": [],
-                        "subcategories": {}
-                    }
+                    added_major.append(major_cat)
+                    existing_data[major_cat] = _new_bucket(major=True)
                 
                 # 중분류 확인
                 if "중분류" in cat_data and cat_data["중분류"]:
-                    if "subcategories" not in existing_data[major_cat]:
-                        existing_data[major_cat]["subcategories"] = {}
-                    
                     for sub_cat in cat_data["중분류"].keys():
                         # 중분류가 없으면 추가
                         if sub_cat not in existing_data[major_cat]["subcategories"]:
-                            print(f"     ➕ 중분류 추가: {major_cat} > {sub_cat}")
-                            existing_data[major_cat]["subcategories"][sub_cat] = {
-                                "auto_keywords": [],
-                                "user_keywords": [],
-                                "enabled_keywords": []
-                            }
+                            added_sub.append(f"{major_cat} > {sub_cat}")
+                            existing_data[major_cat]["subcategories"][sub_cat] = _new_bucket()
+            
+            # 추가 내역은 한 번에 출력
+            if added_major or added_sub:
+                print(f"  ➕ 신규 대분류 {len(added_major)}개, 중분류 {len(added_sub)}개 추가됨: "
+                      f"{', '.join(added_major + added_sub)}")
             
             return existing_data
             
@@ -77,26 +286,18 @@ class CategoryManager:
     def _init_structure(self) -> Dict:
         """초기 계층 구조 생성 (SEED_QUERIES 기반)"""
         try:
-            # SEED_QUERIES를 import하여 구조 생성
-            from auto_keyword_discovery import SEED_QUERIES
+            # SEED_QUERIES 기반 구조 생성
+            if SEED_QUERIES is None:
+                raise ImportError(_SEED_IMPORT_ERROR)
             
             structure = {}
             for major_cat, cat_data in SEED_QUERIES.items():
-                structure[major_cat] = {
-                    "auto_keywords": [],
-                    "user_keywords": [],
-                    "enabled_keywords": [],
-                    "subcategories": {}
-                }
+                structure[major_cat] = _new_bucket(major=True)
                 
                 # 중분류가 있으면 추가
                 if "중분류" in cat_data and cat_data["중분류"]:
                     for sub_cat in cat_data["중분류"].keys():
-                        structure[major_cat]["subcategories"][sub_cat] = {
-                            "auto_keywords": [],
-                            "user_keywords": [],
-                            "enabled_keywords": []
-                        }
+                        structure[major_cat]["subcategories"][sub_cat] = _new_bucket()
             
             print(f"✅ SEED_QUERIES 기반 구조 생성: {len(structure)}개 대분류")
             return structure
@@ -104,28 +305,12 @@ class CategoryManager:
         except Exception as e:
             # SEED_QUERIES를 import할 수 없으면 기본 구조 반환
             print(f"⚠️ SEED_QUERIES import 실패, 기본 구조 사용: {e}")
-            return {
-                "패션의류": {
-                    "auto_keywords": [],
-                    "user_keywords": [],
-                    "enabled_keywords": [],
-                    "subcategories": {
-                        "여성의류": {"auto_keywords": [], "user_keywords": [], "enabled_keywords": []},
-                        "남성의류": {"auto_keywords": [], "user_keywords": [], "enabled_keywords": []},
-                        "언더웨어": {"auto_keywords": [], "user_keywords": [], "enabled_keywords": []},
-                    }
-                },
-                "화장품/미용": {
-                    "auto_keywords": [],
-                    "user_keywords": [],
-                    "enabled_keywords": [],
-                    "subcategories": {
-                        "스킨케어": {"auto_keywords": [], "user_keywords": [], "enabled_keywords": []},
-                        "메이크업": {"auto_keywords": [], "user_keywords": [], "enabled_keywords": []},
-                        "향수": {"auto_keywords": [], "user_keywords": [], "enabled_keywords": []},
-                    }
-                }
-            }
+            structure = {}
+            for major_cat, sub_cats in _FALLBACK_STRUCTURE:
+                structure[major_cat] = _new_bucket(major=True)
+                for sub_cat in sub_cats:
+                    structure[major_cat]["subcategories"][sub_cat] = _new_bucket()
+            return structure
     
     def migrate_from_old_format(self, old_data_path: str = "./naver_categories.json"):
         """
@@ -153,144 +338,150 @@ class CategoryManager:
         """중분류 목록 반환"""
         if major not in self.data:
             return []
-        return list(self.data[major].get("subcategories", {}).keys())
+        return list(self.data[major]["subcategories"].keys())
     
     def add_user_keyword(self, major: str, keyword: str, sub: Optional[str] = None):
         """사용자 지정 키워드 추가"""
-        if major not in self.data:
-            print(f"❌ 카테고리 '{major}'가 존재하지 않습니다.")
-            return False
-        
-        target = self.data[major]
-        if sub:
-            if sub not in target.get("subcategories", {}):
+        resolved = self._resolve(major, sub)
+        if resolved is None:
+            if major not in self.data:
+                print(f"❌ 카테고리 '{major}'가 존재하지 않습니다.")
+            else:
                 print(f"❌ 중분류 '{sub}'가 존재하지 않습니다.")
-                return False
-            target = target["subcategories"][sub]
+            return False
         
         # 중복 체크
-        if keyword in target["user_keywords"]:
+        if not self._apply_add_user(*resolved, keyword):
             print(f"⚠️ '{keyword}'는 이미 존재합니다.")
             return False
         
-        target["user_keywords"].append(keyword)
-        target["enabled_keywords"].append(keyword)
-        self.save()
+        self._mark_dirty(op=("add_user", major, sub, keyword))
         print(f"✅ '{keyword}' 추가 완료!")
         return True
     
     def remove_user_keyword(self, major: str, keyword: str, sub: Optional[str] = None):
         """사용자 지정 키워드 제거"""
-        if major not in self.data:
+        resolved = self._resolve(major, sub)
+        if resolved is None or not self._apply_remove_user(*resolved, keyword):
             return False
         
-        target = self.data[major]
-        if sub:
-            if sub not in target.get("subcategories", {}):
-                return False
-            target = target["subcategories"][sub]
-        
-        if keyword in target["user_keywords"]:
-            target["user_keywords"].remove(keyword)
-            if keyword in target["enabled_keywords"]:
-                target["enabled_keywords"].remove(keyword)
-            self.save()
-            return True
-        
-        return False
+        self._mark_dirty(op=("remove_user", major, sub, keyword))
+        return True
     
     def enable_keyword(self, major: str, keyword: str, sub: Optional[str] = None):
         """키워드 활성화"""
-        if major not in self.data:
+        resolved = self._resolve(major, sub)
+        if resolved is None or not self._apply_enable(*resolved, keyword):
             return False
         
-        target = self.data[major]
-        if sub:
-            if sub not in target.get("subcategories", {}):
-                return False
-            target = target["subcategories"][sub]
-        
-        # 자동 또는 사용자 키워드에 존재해야 함
-        all_keywords = target["auto_keywords"] + target["user_keywords"]
-        
-        if keyword in all_keywords and keyword not in target["enabled_keywords"]:
-            target["enabled_keywords"].append(keyword)
-            self.save()
-            return True
-        
-        return False
+        self._mark_dirty(op=("enable", major, sub, keyword))
+        return True
     
     def disable_keyword(self, major: str, keyword: str, sub: Optional[str] = None):
         """키워드 비활성화"""
-        if major not in self.data:
+        resolved = self._resolve(major, sub)
+        if resolved is None or not self._apply_disable(*resolved, keyword):
             return False
         
-        target = self.data[major]
-        if sub:
-            if sub not in target.get("subcategories", {}):
-                return False
-            target = target["subcategories"][sub]
-        
-        if keyword in target["enabled_keywords"]:
+        self._mark_dirty(op=("disable", major, sub, keyword))
+        return True
+    
+    # 단일 키워드 변경 (저널 재생과 공용, 변경됐으면 True)
+    
+    @staticmethod
+    def _apply_add_user(target: Dict, idx: Dict[str, Set[str]], keyword: str) -> bool:
+        if keyword in idx["user"]:
+            return False
+        idx["user"].add(keyword)
+        target["user_keywords"].append(keyword)
+        if keyword not in idx["enabled"]:
+            idx["enabled"].add(keyword)
+            target["enabled_keywords"].append(keyword)
+        return True
+    
+    @staticmethod
+    def _apply_remove_user(target: Dict, idx: Dict[str, Set[str]], keyword: str) -> bool:
+        if keyword not in idx["user"]:
+            return False
+        idx["user"].discard(keyword)
+        target["user_keywords"].remove(keyword)
+        if keyword in idx["enabled"]:
+            idx["enabled"].discard(keyword)
             target["enabled_keywords"].remove(keyword)
-            self.save()
-            return True
+        return True
+    
+    @staticmethod
+    def _apply_enable(target: Dict, idx: Dict[str, Set[str]], keyword: str) -> bool:
+        # 자동 또는 사용자 키워드에 존재해야 함
+        known = keyword in idx["auto"] or keyword in idx["user"]
+        if not known or keyword in idx["enabled"]:
+            return False
+        idx["enabled"].add(keyword)
+        target["enabled_keywords"].append(keyword)
+        return True
+    
+    @staticmethod
+    def _apply_disable(target: Dict, idx: Dict[str, Set[str]], keyword: str) -> bool:
+        if keyword not in idx["enabled"]:
+            return False
+        idx["enabled"].discard(keyword)
+        target["enabled_keywords"].remove(keyword)
+        return True
+    
+    def _nodes_for(self, major: str, sub: Optional[str], target: Dict, idx: Dict[str, Set[str]]) -> List[Tuple[Dict, Dict[str, Set[str]]]]:
+        """
+        일괄 활성화/비활성화 대상 노드 목록
+        
+        - 중분류 선택 시: 해당 중분류만
+        - 대분류 전체 선택 시: 대분류 + 모든 중분류
+        """
+        if sub:
+            return [(target, idx)]
         
-        return False
+        nodes = [(target, idx)]
+        for sub_name, sub_data in target["subcategories"].items():
+            nodes.append((sub_data, self._index[(major, sub_name)]))
+        return nodes
     
     def enable_all_keywords(self, major: str, sub: Optional[str] = None):
         """모든 키워드 활성화"""
-        if major not in self.data:
+        resolved = self._resolve(major, sub)
+        if resolved is None:
             return False
         
-        target = self.data[major]
-        
-        if sub:
-            # 중분류 선택 시: 해당 중분류만 활성화
-            if sub not in target.get("subcategories", {}):
-                return False
-            target = target["subcategories"][sub]
-            all_keywords = list(set(target.get("auto_keywords", []) + target.get("user_keywords", [])))
-            target["enabled_keywords"] = all_keywords
-        else:
-            # 대분류 전체 선택 시: 대분류 + 모든 중분류 활성화
-            # 대분류 키워드 활성화
-            major_keywords = list(set(target.get("auto_keywords", []) + target.get("user_keywords", [])))
-            target["enabled_keywords"] = major_keywords
-            
-            # 모든 중분류 키워드 활성화
-            subcategories = target.get("subcategories", {})
-            for sub_name, sub_data in subcategories.items():
-                sub_keywords = list(set(sub_data.get("auto_keywords", []) + sub_data.get("user_keywords", [])))
-                sub_data["enabled_keywords"] = sub_keywords
-        
-        self.save()
+        changed = False
+        for node, node_idx in self._nodes_for(major, sub, *resolved):
+            all_keywords = node_idx["auto"] | node_idx["user"]
+            # 이미 모두 활성화된 노드는 건너뜀
+            if all_keywords == node_idx["enabled"]:
+                continue
+            node["enabled_keywords"] = list(all_keywords)
+            node_idx["enabled"] = all_keywords
+            changed = True
+        
+        # 변경이 없으면 저장 생략
+        if changed:
+            self._mark_dirty()
         return True
     
     def disable_all_keywords(self, major: str, sub: Optional[str] = None):
         """모든 키워드 비활성화"""
-        if major not in self.data:
+        resolved = self._resolve(major, sub)
+        if resolved is None:
             return False
         
-        target = self.data[major]
-        
-        if sub:
-            # 중분류 선택 시: 해당 중분류만 비활성화
-            if sub not in target.get("subcategories", {}):
-                return False
-            target = target["subcategories"][sub]
-            target["enabled_keywords"] = []
-        else:
-            # 대분류 전체 선택 시: 대분류 + 모든 중분류 비활성화
-            # 대분류 키워드 비활성화
-            target["enabled_keywords"] = []
-            
-            # 모든 중분류 키워드 비활성화
-            subcategories = target.get("subcategories", {})
-            for sub_name, sub_data in subcategories.items():
-                sub_data["enabled_keywords"] = []
-        
-        self.save()
+        changed = False
+        for node, node_idx in self._nodes_for(major, sub, *resolved):
+            # 이미 비어 있는 노드는 건너뜀
+            if not node.get("enabled_keywords"):
+                continue
+            node["enabled_keywords"] = []
+            node_idx["enabled"].clear()
+            changed = True
+        
+        # 변경이 없으면 저장 생략
+        if changed:
+            self._mark_dirty()
         return True
     
     def get_all_keywords(self, major: str, sub: Optional[str] = None, only_enabled: bool = False) -> Dict[str, List[str]]:
@@ -310,56 +501,27 @@ class CategoryManager:
         if major not in self.data:
             return {"auto": [], "user": [], "enabled": []}
         
+        if only_enabled:
+            return {"auto": [], "user": [], "enabled": self.get_enabled_keywords(major, sub)}
+        
         # 중분류 선택한 경우: 해당 중분류만
         if sub:
-            target = self.data[major]
-            if sub not in target.get("subcategories", {}):
+            resolved = self._resolve(major, sub)
+            if resolved is None:
                 return {"auto": [], "user": [], "enabled": []}
-            target = target["subcategories"][sub]
+            target = resolved[0]
             
-            result = {
+            return {
                 "auto": target.get("auto_keywords", []),
                 "user": target.get("user_keywords", []),
                 "enabled": target.get("enabled_keywords", [])
             }
-            
-            if only_enabled:
-                return {
-                    "auto": [],
-                    "user": [],
-                    "enabled": result["enabled"]
-                }
-            
-            return result
         
         # 대분류 전체 선택: 대분류 + 모든 중분류 병합
-        major_data = self.data[major]
-        
-        all_auto = set(major_data.get("auto_keywords", []))
-        all_user = set(major_data.get("user_keywords", []))
-        all_enabled = set(major_data.get("enabled_keywords", []))
-        
-        # 모든 중분류 키워드 병합
-        subcategories = major_data.get("subcategories", {})
-        for sub_name, sub_data in subcategories.items():
-            all_auto.update(sub_data.get("auto_keywords", []))
-            all_user.update(sub_data.get("user_keywords", []))
-            all_enabled.update(sub_data.get("enabled_keywords", []))
-        
-        result = {
-            "auto": sorted(list(all_auto)),
-            "user": sorted(list(all_user)),
-            "enabled": sorted(list(all_enabled))
+        return {
+            key: list(self._aggregate_major(major, key))
+            for key in ("auto", "user", "enabled")
         }
-        
-        if only_enabled:
-            return {
-                "auto": [],
-                "user": [],
-                "enabled": result["enabled"]
-            }
-        
-        return result
     
     def get_enabled_keywords(self, major: str, sub: Optional[str] = None) -> List[str]:
         """
@@ -373,25 +535,41 @@ class CategoryManager:
         
         # 중분류 선택한 경우: 해당 중분류만
         if sub:
-            keywords = self.get_all_keywords(major, sub, only_enabled=True)
-            return keywords["enabled"]
+            resolved = self._resolve(major, sub)
+            if resolved is None:
+                return []
+            return resolved[0].get("enabled_keywords", [])
         
-        # 대분류 전체 선택: 대분류 + 모든 중분류 병합
-        all_enabled = set()
+        # 대분류 전체 선택: 대분류 + 모든 중분류 병합 (enabled만 계산)
+        return list(self._aggregate_major(major, "enabled"))
+    
+    def _aggregate_major(self, major: str, key: str) -> tuple:
+        """
+        대분류 + 모든 중분류 키워드 병합 결과 (정렬된 tuple)
         
-        # 대분류 키워드
-        major_keywords = self.data[major].get("enabled_keywords", [])
-        all_enabled.update(major_keywords)
+        Args:
+            major: 대분류 이름
+            key: "auto", "user", "enabled" 중 하나 (필요한 종류만 계산)
         
-        # 모든 중분류 키워드 병합
-        subcategories = self.data[major].get("subcategories", {})
-        for sub_name, sub_data in subcategories.items():
-            sub_enabled = sub_data.get("enabled_keywords", [])
-            all_enabled.update(sub_enabled)
+        변경이 없으면 이전 결과를 재사용 (화면 렌더링마다 반복 호출되므로 캐시)
+        """
+        cached = self._agg_cache.get((major, key))
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
         
-        return sorted(list(all_enabled))
+        major_data = self.data[major]
+        field = f"{key}_keywords"
+        
+        # 대분류 + 모든 중분류 키워드를 한 번에 이어서 중복 제거 후 정렬
+        merged = tuple(sorted(set(chain.from_iterable(
+            node.get(field, [])
+            for node in chain((major_data,), major_data["subcategories"].values())
+        ))))
+        self._agg_cache[(major, key)] = (self._version, merged)
+        return merged
     
-    def update_auto_keywords(self, major: str, keywords: List[str], sub: Optional[str] = None):
+    def update_auto_keywords(self, major: str, keywords: List[str], sub: Optional[str] = None,
+                             save: bool = True):
         """
         자동 수집 키워드 업데이트 (항상 교체 모드)
         
@@ -399,24 +577,29 @@ class CategoryManager:
             major: 대분류 이름
             keywords: 새로운 키워드 리스트
             sub: 중분류 이름 (선택사항)
+            save: 즉시 파일 저장 여부 (False면 이후 save() 또는 batch() 종료 시 저장)
         """
-        if major not in self.data:
+        resolved = self._resolve(major, sub)
+        if resolved is None:
             return False
         
-        target = self.data[major]
-        if sub:
-            if sub not in target.get("subcategories", {}):
-                return False
-            target = target["subcategories"][sub]
+        target = resolved[0]
+        user_keywords = target.get("user_keywords", [])
+        # 자동·사용자 키워드에 모두 있는 키워드는 한 번만 (순서 유지)
+        enabled_keywords = list(dict.fromkeys(chain(keywords, user_keywords)))
+        
+        # 자동 키워드와 활성화 목록이 그대로면 저장 생략
+        if target.get("auto_keywords") == keywords and target.get("enabled_keywords") == enabled_keywords:
+            return True
         
         # 기존 자동 키워드를 새로운 것으로 교체
         target["auto_keywords"] = keywords
         
         # enabled_keywords도 업데이트 (사용자 키워드는 유지)
-        user_keywords = target.get("user_keywords", [])
-        target["enabled_keywords"] = keywords + user_keywords
+        target["enabled_keywords"] = enabled_keywords
+        self._index[(major, sub or None)] = self._index_entry_for(target)
         
-        self.save()
+        self._mark_dirty(save=save)
         return True
     
     def add_subcategory(self, major: str, sub_name: str):
@@ -424,43 +607,190 @@ class CategoryManager:
         if major not in self.data:
             return False
         
-        if sub_name in self.data[major].get("subcategories", {}):
+        if sub_name in self.data[major]["subcategories"]:
             print(f"⚠️ '{sub_name}'는 이미 존재합니다.")
             return False
         
-        if "subcategories" not in self.data[major]:
-            self.data[major]["subcategories"] = {}
+        bucket = _new_bucket()
+        self.data[major]["subcategories"][sub_name] = bucket
+        self._index[(major, sub_name)] = self._index_entry_for(bucket)
         
-        self.data[major]["subcategories"][sub_name] = {
-            "auto_keywords": [],
-            "user_keywords": [],
-            "enabled_keywords": []
+        self._mark_dirty()
+        return True
+    
+    def _mark_dirty(self, save: bool = True, op: Optional[Tuple] = None):
+        """
+        변경 기록 후 즉시 저장 (batch() 블록 안에서는 블록 종료 시 한 번만 저장)
+        
+        Args:
+            save: False면 변경만 기록하고 저장은 이후 save()/batch()에 맡김
+            op: 단일 키워드 변경 (op, major, sub, keyword) - 지정 시 전체 저장 대신 저널에 추가
+        """
+        self._dirty = True
+        self._version += 1
+        if not save or self._in_batch:
+            return
+        
+        if op is not None and self._journal_ops + 1 < JOURNAL_COMPACT_EVERY:
+            self._append_journal(op)
+        else:
+            self.save()
+    
+    def _append_journal(self, op: Tuple):
+        """단일 키워드 변경을 저널 파일에 한 줄 추가"""
+        name, major, sub, keyword = op
+        line = json.dumps({"op": name, "major": major, "sub": sub or None, "kw": keyword}, ensure_ascii=False)
+        with open(self._journal_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        self._journal_ops += 1
+    
+    def _replay_journal(self) -> int:
+        """
+        마지막 저장 이후의 저널을 데이터에 반영
+        
+        Returns:
+            반영한 변경 수
+        """
+        if not self._journal_path.exists():
+            return 0
+        
+        appliers = {
+            "add_user": self._apply_add_user,
+            "remove_user": self._apply_remove_user,
+            "enable": self._apply_enable,
+            "disable": self._apply_disable
         }
         
-        self.save()
-        return True
+        count = 0
+        with open(self._journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 쓰는 도중 중단된 마지막 줄은 무시
+                    print(f"⚠️ 저널 항목 무시: {line.strip()[:50]}")
+                    continue
+                
+                resolved = self._resolve(entry["major"], entry["sub"])
+                applier = appliers.get(entry["op"])
+                if resolved is not None and applier is not None:
+                    applier(*resolved, entry["kw"])
+                count += 1
+        
+        return count
+    
+    @contextmanager
+    def batch(self):
+        """
+        여러 변경을 묶어 한 번만 저장
+        
+        Example:
+            with manager.batch():
+                for sub, keywords in results.items():
+                    manager.update_auto_keywords(major, keywords, sub=sub)
+        """
+        if self._in_batch:
+            # 중첩된 batch는 바깥 블록에서 저장
+            yield self
+            return
+        
+        self._in_batch = True
+        try:
+            yield self
+        finally:
+            self._in_batch = False
+            if self._dirty:
+                self.save()
     
     def save(self):
-        """데이터 저장"""
-        # 백업
-        if self.data_path.exists():
-            backup_path = self.data_path.with_suffix(f'.backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
-            import shutil
-            shutil.copy(self.data_path, backup_path)
+        """
+        데이터 저장 (저널 압축 포함)
+        
+        임시 파일에 쓴 뒤 교체하므로 저장 중 중단돼도 기존 파일이 깨지지 않음.
+        백업은 BACKUP_EVERY번째 저장마다 기존 파일을 순환 슬롯
+        (categories_hierarchical.backup.{0..MAX_BACKUPS-1}.json)에 하드 링크로 보관
+        (원본 경로가 비는 순간 없이 보관, 백업이 실패해도 저장은 계속).
+        """
+        payload = _dump_json(self._with_seed_sig(self.data))
+        
+        # 마지막 저장과 내용이 같으면 (변경 후 되돌린 경우 등) 파일 쓰기 생략
+        content_hash = hashlib.blake2b(payload, digest_size=16).digest()
+        if content_hash == self._last_hash and self.data_path.exists():
+            self._dirty = False
+            self._journal_path.unlink(missing_ok=True)
+            self._journal_ops = 0
+            return
         
-        with open(self.data_path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        tmp_path = _write_temp(self.data_path, payload)
+        try:
+            # 백업 (실패해도 저장은 계속, 원본 경로를 건드리는 건 아래 os.replace 하나뿐)
+            if self._save_count % BACKUP_EVERY == 0 and self.data_path.exists():
+                self._backup_current()
+            
+            os.replace(tmp_path, self.data_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._last_hash = content_hash
+        self._save_count += 1
+        self._dirty = False
+        
+        # 전체 파일에 반영됐으므로 저널 비움
+        self._journal_path.unlink(missing_ok=True)
+        self._journal_ops = 0
+    
+    def _backup_current(self):
+        """
+        현재 파일을 백업 슬롯에 보관
+        
+        하드 링크를 우선 사용하고, 하드 링크를 지원하지 않는 파일시스템
+        (FAT/exFAT, 일부 네트워크 드라이브 등)에서는 복사. 복사도 실패하면 경고만 출력.
+        """
+        backup_path = self._backup_slot_path()
+        try:
+            backup_path.unlink(missing_ok=True)
+            os.link(self.data_path, backup_path)
+        except OSError:
+            try:
+                shutil.copy2(self.data_path, backup_path)
+            except OSError as e:
+                print(f"⚠️ 백업 실패 (저장은 계속): {e}")
+    
+    def _backup_slot_path(self) -> Path:
+        """
+        이번에 쓸 백업 슬롯 경로
+        
+        인스턴스마다 저장 횟수가 0부터 시작하므로 슬롯은 기존 백업 파일로 결정:
+        비어 있는 슬롯이 있으면 그 슬롯, 모두 차 있으면 가장 오래된(mtime) 슬롯.
+        """
+        slots = [self.data_path.with_suffix(f".backup.{i}.json") for i in range(MAX_BACKUPS)]
+        for slot in slots:
+            if not slot.exists():
+                return slot
+        return min(slots, key=lambda slot: slot.stat().st_mtime)
+    
+    def export_pretty(self, path: str):
+        """
+        사람이 읽기 좋은 형식(들여쓰기 2칸)으로 내보내기
+        
+        저장 파일은 압축 형식이므로 직접 확인/편집할 때 사용
+        """
+        _write_json(Path(path), self.data, pretty=True)
+        print(f"✅ 내보내기: {path}")
     
     def get_stats(self) -> Dict:
         """전체 통계"""
-        total_major = len(self.data)
-        total_sub = sum(len(v.get("subcategories", {})) for v in self.data.values())
-        total_auto = sum(len(v.get("auto_keywords", [])) for v in self.data.values())
-        total_user = sum(len(v.get("user_keywords", [])) for v in self.data.values())
-        total_enabled = sum(len(v.get("enabled_keywords", [])) for v in self.data.values())
+        total_sub = total_auto = total_user = total_enabled = 0
+        
+        # 한 번 순회로 모든 합계 계산
+        for v in self.data.values():
+            total_sub += len(v["subcategories"])
+            total_auto += len(v.get("auto_keywords", ()))
+            total_user += len(v.get("user_keywords", ()))
+            total_enabled += len(v.get("enabled_keywords", ()))
         
         return {
-            "대분류": total_major,
+            "대분류": len(self.data),
             "중분류": total_sub,
             "자동 키워드": total_auto,
             "사용자 키워드": total_user,
@@ -4,15 +4,115 @@
 
 import os
 import json
+import time
+import hashlib
+import logging
+import threading
 import requests
 import urllib3
+import numpy as np
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from itertools import batched as _batched  # Python 3.12+
+except ImportError:
+    def _batched(iterable, n):
+        """iterable을 n개씩 묶은 tuple로 반환 (itertools.batched 대체)"""
+        it = iter(iterable)
+        while batch := tuple(islice(it, n)):
+            yield batch
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 # SSL 경고 메시지 비활성화
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# DataLab 한 번의 요청에 담을 수 있는 최대 키워드(그룹) 수
+DATALAB_BATCH_SIZE = 5
+
+# 동시 배치 요청 수 (DataLab 호출 한도를 넘지 않도록 작게 유지)
+DATALAB_MAX_WORKERS = 5
+
+# 급상승 분석 결과의 수치 컬럼
+RATIO_COLUMNS = ("first_ratio", "last_ratio", "abs_change", "pct_change", "avg_ratio")
+
+# 트렌드 응답 디스크 캐시 (같은 요청 본문은 TTL 내 재호출 생략, 0이면 비활성화)
+# - 환경변수 NAVER_CACHE_DISABLE=1 로 끌 수 있음 (테스트/디버깅용)
+DATALAB_CACHE_DIR = Path("./.cache/datalab")
+DATALAB_CACHE_TTL = 24 * 60 * 60  # 24시간
+
+# HTTP 세션 재사용 (Keep-Alive로 배치마다 TLS 핸드셰이크 반복 방지)
+# - 조회용 POST라 재시도해도 안전 (raise_on_status=False: 최종 응답은 아래 상태코드별 처리로 전달)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["POST"],
+            respect_retry_after_header=True,  # 429의 Retry-After 만큼 대기 후 재시도
+            raise_on_status=False
+        )
+    )
+)
+
+
+def _cache_enabled() -> bool:
+    """트렌드 캐시 사용 여부"""
+    return DATALAB_CACHE_TTL > 0 and not os.getenv("NAVER_CACHE_DISABLE")
+
+
+def _body_key(body: dict) -> bytes:
+    """요청 본문을 키 정렬된 JSON 바이트로 정규화 (그대로 전송 본문 겸 캐시 키로 사용)"""
+    if orjson is not None:
+        return orjson.dumps(body, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")
+
+
+def _trend_cache_path(body_key: bytes) -> Path:
+    """요청 본문별 캐시 파일 경로 (정규화한 본문의 SHA-256)"""
+    return DATALAB_CACHE_DIR / f"{hashlib.sha256(body_key).hexdigest()}.json"
+
+
+def _load_cached_trend(cache_path: Path):
+    """TTL 이내의 캐시된 트렌드 응답 로드 (없거나 만료되면 None)"""
+    try:
+        if time.time() - cache_path.stat().st_mtime > DATALAB_CACHE_TTL:
+            return None
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_trend(cache_path: Path, data: dict):
+    """트렌드 응답을 캐시에 저장 (임시 파일 작성 후 교체)"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("⚠️ 트렌드 캐시 저장 실패: %s", e)
+
 
 def datalab_keyword_trend(
     client_id: str,
@@ -23,7 +123,8 @@ def datalab_keyword_trend(
     time_unit: str = "date",  # "date" | "week" | "month"
     device: str = "pc,mobile",  # "pc" | "mobile" | "pc,mobile"
     gender: str = "",           # "" | "m" | "f"
-    ages: Optional[List[str]] = None  # e.g. ["10","20","30","40","50","60"]
+    ages: Optional[List[str]] = None,  # e.g. ["10","20","30","40","50","60"]
+    use_cache: bool = True
 ) -> dict:
     """
     네이버 DataLab 검색어 트렌드 API 호출.
@@ -39,26 +140,20 @@ def datalab_keyword_trend(
         device: 디바이스 (pc, mobile, pc,mobile)
         gender: 성별 ("", "m", "f")
         ages: 연령대 리스트
+        use_cache: False면 메모리/디스크 캐시를 건너뛰고 항상 API 호출
     
     Returns:
-        API 응답 JSON
+        API 응답 JSON (캐시와 공유될 수 있으므로 수정하지 말 것)
     """
     if ages is None:
         ages = []
     
-    url = "https://openapi.naver.com/v1/datalab/search"
-    headers = {
-        "X-Naver-Client-Id": client_id,
-        "X-Naver-Client-Secret": client_secret,
-        "Content-Type": "application/json"
-    }
-    
     # 각 키워드를 개별 그룹으로 생성
     if isinstance(keywords, str):
         keywords = [keywords]
     
     # 네이버 API는 최대 5개 그룹까지 허용
-    if len(keywords) > 5:
+    if len(keywords) > DATALAB_BATCH_SIZE:
         raise ValueError("네이버 DataLab API는 한 번에 최대 5개 키워드만 조회 가능합니다.")
     
     groups = [{"groupName": kw, "keywords": [kw]} for kw in keywords]
@@ -86,11 +181,48 @@ def datalab_keyword_trend(
     if ages:
         body["ages"] = ages
     
+    key = _body_key(body)
+    if use_cache and _cache_enabled():
+        return _cached_trend(key, client_id, client_secret)
+    return _post_trend(key, client_id, client_secret, use_cache=False)
+
+
+def _post_trend(
+    body_key: bytes,
+    client_id: str,
+    client_secret: str,
+    use_cache: bool = True
+) -> dict:
+    """
+    정규화된 요청 본문으로 DataLab API 호출 (디스크 캐시 확인/저장 포함)
+    
+    Args:
+        body_key: _body_key()로 만든 요청 본문
+        client_id: 네이버 API 클라이언트 ID
+        client_secret: 네이버 API 클라이언트 Secret
+        use_cache: 디스크 캐시 사용 여부
+    
+    Returns:
+        API 응답 JSON
+    """
+    if use_cache:
+        cache_path = _trend_cache_path(body_key)
+        cached = _load_cached_trend(cache_path)
+        if cached is not None:
+            return cached
+    
+    url = "https://openapi.naver.com/v1/datalab/search"
+    headers = {
+        "X-Naver-Client-Id": client_id,
+        "X-Naver-Client-Secret": client_secret,
+        "Content-Type": "application/json"
+    }
+    
     try:
         # SSL 검증 비활성화 (회사 보안 프록시 환경 대응)
-        resp = requests.post(url, headers=headers, data=json.dumps(body), timeout=30, verify=False)
+        resp = _SESSION.post(url, headers=headers, data=body_key, timeout=30, verify=False)
         resp.raise_for_status()
-        return resp.json()
+        data = orjson.loads(resp.content) if orjson is not None else resp.json()
     except requests.exceptions.HTTPError as e:
         if resp.status_code == 401:
             raise Exception("API 인증 실패: Client ID 또는 Secret을 확인하세요")
@@ -102,6 +234,57 @@ def datalab_keyword_trend(
             raise Exception(f"API 오류 ({resp.status_code}): {resp.text}")
     except requests.exceptions.RequestException as e:
         raise Exception(f"네트워크 오류: {str(e)}")
+    
+    if use_cache:
+        _save_cached_trend(cache_path, data)
+    
+    return data
+
+
+@lru_cache(maxsize=256)
+def _cached_trend(body_key: bytes, client_id: str, client_secret: str) -> dict:
+    """
+    프로세스 내 메모리 캐시 (같은 본문 + 같은 인증 정보는 재호출하지 않음)
+    
+    실패한 요청은 예외가 전파되어 캐시되지 않음.
+    반환된 dict는 캐시와 공유되므로 수정하지 말 것.
+    """
+    return _post_trend(body_key, client_id, client_secret)
+
+
+def clear_trend_cache() -> None:
+    """메모리에 캐시된 트렌드 응답 비우기 (디스크 캐시는 유지)"""
+    _cached_trend.cache_clear()
+
+
+def _submit_trend_batches(
+    executor: ThreadPoolExecutor,
+    batches: List[List[str]],
+    client_id: str,
+    client_secret: str,
+    **params
+) -> List[Future]:
+    """
+    배치별 datalab_keyword_trend 요청을 한 번에 제출
+    
+    Args:
+        executor: 요청을 실행할 스레드 풀
+        batches: 5개 이하 키워드 묶음 리스트
+        **params: datalab_keyword_trend에 전달할 나머지 인자 (기간, 기기 등)
+    
+    Returns:
+        배치 순서와 같은 Future 리스트
+    """
+    return [
+        executor.submit(
+            datalab_keyword_trend,
+            client_id=client_id,
+            client_secret=client_secret,
+            keywords=batch,
+            **params
+        )
+        for batch in batches
+    ]
 
 
 def find_rising_keywords(
@@ -136,42 +319,41 @@ def find_rising_keywords(
         급상승 키워드 DataFrame
     """
     all_rows = []
-    total_batches = (len(keywords) + 4) // 5  # 올림 계산
+    # 키워드를 5개씩 나누어 API 호출
+    batches = list(_batched(keywords, DATALAB_BATCH_SIZE))
+    total_batches = len(batches)
     success_count = 0
     error_count = 0
     
     print(f"\n🔍 분석 시작: {len(keywords)}개 키워드 ({total_batches}개 배치)")
     
-    # 키워드를 5개씩 나누어 API 호출
-    for i in range(0, len(keywords), 5):
-        batch = keywords[i:i+5]
-        batch_num = i//5 + 1
-        
-        print(f"\n📦 배치 {batch_num}/{total_batches}: {', '.join(batch[:2])}{'...' if len(batch) > 2 else ''}")
+    # 모든 배치를 동시에 요청 (블록 종료 시 전체 완료 대기)
+    with ThreadPoolExecutor(max_workers=DATALAB_MAX_WORKERS) as executor:
+        futures = _submit_trend_batches(
+            executor, batches, client_id, client_secret,
+            start_date=start_date, end_date=end_date, time_unit=time_unit,
+            device=device, gender=gender, ages=ages
+        )
+    
+    # 결과는 배치 순서대로 처리 (실패한 배치는 future.result()에서 예외 발생)
+    for batch_num, (batch, future) in enumerate(zip(batches, futures), start=1):
+        logger.debug("📦 배치 %d/%d: %s", batch_num, total_batches, ", ".join(batch))
         
         try:
-            data = datalab_keyword_trend(
-                client_id=client_id,
-                client_secret=client_secret,
-                keywords=batch,
-                start_date=start_date,
-                end_date=end_date,
-                time_unit=time_unit,
-                device=device,
-                gender=gender,
-                ages=ages
-            )
+            data = future.result()
             
             for series in data["results"]:
                 kw = series["title"]
                 timeline = series["data"]
                 
                 if not timeline:
-                    print(f"   ⚠️  '{kw}': 데이터 없음")
+                    logger.debug("⚠️ '%s': 데이터 없음", kw)
                     continue
                 
-                first = timeline[0]["ratio"]
-                last = timeline[-1]["ratio"]
+                # 시계열을 배열 하나로 모아 처음/마지막/평균을 C 루프로 계산
+                ratios = np.fromiter((t["ratio"] for t in timeline), dtype=np.float64, count=len(timeline))
+                first = float(ratios[0])
+                last = float(ratios[-1])
                 change = last - first
                 
                 # 변화율 계산
@@ -183,18 +365,11 @@ def find_rising_keywords(
                     change_pct = 0
                 
                 # 평균 검색량
-                avg_ratio = sum(t["ratio"] for t in timeline) / len(timeline)
+                avg_ratio = float(ratios.mean())
                 
-                all_rows.append({
-                    "keyword": kw,
-                    "first_ratio": first,
-                    "last_ratio": last,
-                    "abs_change": change,
-                    "pct_change": round(change_pct, 2),
-                    "avg_ratio": round(avg_ratio, 2)
-                })
+                all_rows.append((kw, first, last, change, change_pct, avg_ratio))
                 
-                print(f"   ✅ '{kw}': 변화 {change:+.1f} ({change_pct:+.1f}%)")
+                logger.debug("✅ '%s': 변화 %+.1f (%+.1f%%)", kw, change, change_pct)
             
             success_count += 1
             
@@ -230,11 +405,20 @@ def find_rising_keywords(
         print("   4. 네트워크 오류\n")
         return pd.DataFrame()
     
-    df = pd.DataFrame(all_rows).sort_values(["abs_change", "pct_change"], ascending=False)
-    df = df.reset_index(drop=True)
+    df = pd.DataFrame.from_records(
+        all_rows,
+        columns=["keyword", "first_ratio", "last_ratio", "abs_change", "pct_change", "avg_ratio"]
+    )
+    # 반올림은 행마다 하지 않고 컬럼 단위로 한 번에 처리
+    df[["pct_change", "avg_ratio"]] = df[["pct_change", "avg_ratio"]].round(2)
+    df = df.sort_values(["abs_change", "pct_change"], ascending=False).reset_index(drop=True)
+    
+    # 검색량 비율(0~100)은 float32로도 충분한 정밀도 → 수치 컬럼 메모리 절반
+    df = df.astype({col: np.float32 for col in RATIO_COLUMNS})
     
-    # 상위 topk개를 급상승으로 라벨링
-    df["label"] = ["급상승"] * min(len(df), topk) + ["정상"] * max(0, len(df) - topk)
+    # 상위 topk개를 급상승으로 라벨링 (행마다 문자열 대신 1바이트 코드의 범주형)
+    codes = (np.arange(len(df)) >= topk).astype(np.int8)
+    df["label"] = pd.Categorical.from_codes(codes, categories=["급상승", "정상"])
     
     return df
 
@@ -256,64 +440,107 @@ def get_keyword_timeline(
     Returns:
         날짜별 키워드 검색량 DataFrame (wide format)
     """
-    all_timelines = {}
+    rows = []
+    titles = []
     
-    # 키워드를 5개씩 나누어 API 호출
-    for i in range(0, len(keywords), 5):
-        batch = keywords[i:i+5]
+    # 키워드를 5개씩 나누어 동시에 API 호출
+    batches = list(_batched(keywords, DATALAB_BATCH_SIZE))
+    with ThreadPoolExecutor(max_workers=DATALAB_MAX_WORKERS) as executor:
+        futures = _submit_trend_batches(
+            executor, batches, client_id, client_secret,
+            start_date=start_date, end_date=end_date, time_unit=time_unit,
+            device=device, gender=gender, ages=ages
+        )
+    
+    for batch_num, future in enumerate(futures, start=1):
         try:
-            data = datalab_keyword_trend(
-                client_id=client_id,
-                client_secret=client_secret,
-                keywords=batch,
-                start_date=start_date,
-                end_date=end_date,
-                time_unit=time_unit,
-                device=device,
-                gender=gender,
-                ages=ages
-            )
+            data = future.result()
             
             for series in data["results"]:
                 kw = series["title"]
-                timeline = series["data"]
-                all_timelines[kw] = {t["period"]: t["ratio"] for t in timeline}
+                titles.append(kw)
+                rows.extend((t["period"], kw, t["ratio"]) for t in series["data"])
         except Exception as e:
-            print(f"배치 {i//5 + 1} 처리 중 오류: {str(e)}")
+            logger.warning("배치 %d 처리 중 오류: %s", batch_num, e)
             continue
     
-    if not all_timelines:
+    if not titles:
         return pd.DataFrame()
     
-    # DataFrame으로 변환
-    df = pd.DataFrame(all_timelines)
+    # long format으로 모은 뒤 한 번에 wide format으로 변환
+    long_df = pd.DataFrame.from_records(rows, columns=["period", "keyword", "ratio"])
+    long_df["period"] = pd.to_datetime(long_df["period"], format="%Y-%m-%d", cache=True)
+    # 같은 키워드가 중복 요청된 경우 마지막 응답을 사용 (기존 dict 덮어쓰기와 동일)
+    long_df = long_df.drop_duplicates(["period", "keyword"], keep="last")
+    df = long_df.pivot(index="period", columns="keyword", values="ratio")
+    
+    # 컬럼은 응답 순서대로 유지 (데이터가 비어있는 키워드도 포함)
+    df = df.reindex(columns=list(dict.fromkeys(titles)))
+    df.columns.name = None
     df.index.name = "date"
     
     # 날짜 인덱스를 시간 순서대로 정렬 (중요!)
-    df.index = pd.to_datetime(df.index)
     df = df.sort_index()
     
     return df
 
 
-# 기본 키워드 풀 (예시)
+def get_keyword_timelines_batched(
+    client_id: str,
+    client_secret: str,
+    keywords: List[str],
+    start_date: str,
+    end_date: str,
+    time_unit: str = "date"
+) -> Dict[str, pd.Series]:
+    """
+    키워드별 시계열을 5개씩 묶은 요청으로 한 번에 조회
+    
+    키워드마다 단독 요청하는 것과 같은 값이 되도록
+    각 시계열을 자기 최대값 기준 0~100으로 다시 맞춤.
+    (DataLab 지수는 한 요청 안의 최대값을 100으로 하는 상대값)
+    
+    Returns:
+        {키워드: 날짜 인덱스 Series} (응답이 없는 키워드는 제외)
+    """
+    df = get_keyword_timeline(
+        client_id=client_id,
+        client_secret=client_secret,
+        keywords=keywords,
+        start_date=start_date,
+        end_date=end_date,
+        time_unit=time_unit
+    )
+    
+    timelines = {}
+    for kw in df.columns:
+        series = df[kw].dropna()
+        peak = series.max()
+        if peak > 0:
+            series = series * (100.0 / peak)
+        timelines[kw] = series
+    
+    return timelines
+
+
+# 기본 키워드 풀 (예시, 읽기 전용이라 tuple로 고정)
 DEFAULT_KEYWORDS = {
-    "화장품/미용": [
+    "화장품/미용": (
         "로션", "바이오더마", "피지오겔", "아벤느", "에스트라",
         "마녀공장", "닥터지", "시카크림", "선크림", "비타민C",
         "레티놀", "히알루론산", "나이아신아마이드", "세럼", "앰플",
         "토너", "에센스", "클렌징", "팩", "마스크팩"
-    ],
-    "건강/의약품": [
+    ),
+    "건강/의약품": (
         "비타민", "유산균", "오메가3", "프로폴리스", "홍삼",
         "루테인", "콜라겐", "마그네슘", "철분", "아연",
         "타이레놀", "게보린", "이지엔6", "베아제", "닥터베아제"
-    ],
-    "식품": [
+    ),
+    "식품": (
         "프로틴", "쉐이크", "견과류", "다크초콜릿", "올리브오일",
         "아몬드", "꿀", "현미", "귀리", "치아씨드"
-    ],
-    "생활/건강": [
+    ),
+    "생활/건강": (
         # 위생용품
         "마스크", "손소독제", "알콜솜", "물티슈", "세정제",
         # 의료용품
@@ -326,8 +553,8 @@ DEFAULT_KEYWORDS = {
         "생리대", "탐폰", "생리컵",
         # 건강관리
         "찜질팩", "냉찜질", "온열팩", "안마기", "족욕기"
-    ],
-    "종근당 제품": [
+    ),
+    "종근당 제품": (
         # 영양제/건강기능식품
         "키포벨", "키포벨산", "락토핏",
         # 외용제/피부약
@@ -346,6 +573,10 @@ DEFAULT_KEYWORDS = {
         "뮤코다",
         # 기타
         "텔미트랜", "두테스몰"
-    ]
+    )
 }
 
+# 카테고리별 기본 키워드 멤버십 조회용 (O(1) 포함 여부 확인)
+DEFAULT_KEYWORDS_INDEX = {
+    category: frozenset(keywords) for category, keywords in DEFAULT_KEYWORDS.items()
+}
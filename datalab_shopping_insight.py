@@ -5,13 +5,43 @@
 
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict
 import json
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
 
 # SSL 경고 비활성화
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# 동시 카테고리 요청 수
+INSIGHT_MAX_WORKERS = 5
+
+# HTTP 세션 재사용 (Keep-Alive로 요청마다 TLS 핸드셰이크 반복 방지)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["POST"],
+            respect_retry_after_header=True,  # 429의 Retry-After 만큼 대기 후 재시도
+            raise_on_status=False
+        )
+    )
+)
+
 
 def get_shopping_category_keywords(
     client_id: str,
@@ -69,15 +99,15 @@ def get_shopping_category_keywords(
         body["ages"] = ages
     
     try:
-        response = requests.post(
+        response = _SESSION.post(
             url, 
             headers=headers, 
-            data=json.dumps(body), 
+            data=orjson.dumps(body) if orjson is not None else json.dumps(body), 
             timeout=30, 
             verify=False
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content) if orjson is not None else response.json()
     except requests.exceptions.HTTPError as e:
         if response.status_code == 401:
             raise Exception("API 인증 실패: Client ID 또는 Secret을 확인하세요")
@@ -120,21 +150,19 @@ def extract_keywords_from_shopping_insight(
         )
         
         # 키워드 추출 (API 응답 구조에 따라 조정 필요)
-        if "results" in data:
-            for result in data["results"]:
-                if "keywords" in result:
-                    for kw in result["keywords"]:
-                        if isinstance(kw, dict) and "keyword" in kw:
-                            keywords.add(kw["keyword"])
-                        elif isinstance(kw, str):
-                            keywords.add(kw)
+        for result in data.get("results", ()):
+            for kw in result.get("keywords", ()):
+                if isinstance(kw, dict) and "keyword" in kw:
+                    keywords.add(kw["keyword"])
+                elif isinstance(kw, str):
+                    keywords.add(kw)
         
         print(f"✓ {category_name}: {len(keywords)}개 키워드 수집")
         
     except Exception as e:
         print(f"✗ {category_name} 수집 실패: {str(e)}")
     
-    return list(keywords)[:max_keywords]
+    return list(islice(keywords, max_keywords))
 
 
 def auto_collect_keywords(
@@ -174,16 +202,22 @@ def auto_collect_keywords(
     print("🛍️ 쇼핑인사이트 API로 키워드 자동 수집")
     print("="*60)
     
-    for category in categories:
-        keywords = extract_keywords_from_shopping_insight(
-            client_id=client_id,
-            client_secret=client_secret,
-            start_date=start_date,
-            end_date=end_date,
-            category_name=category,
-            max_keywords=50
+    # 모든 카테고리를 동시에 요청하고 결과는 카테고리 순서대로 반영
+    with ThreadPoolExecutor(max_workers=INSIGHT_MAX_WORKERS) as executor:
+        results = executor.map(
+            lambda category: extract_keywords_from_shopping_insight(
+                client_id=client_id,
+                client_secret=client_secret,
+                start_date=start_date,
+                end_date=end_date,
+                category_name=category,
+                max_keywords=50
+            ),
+            categories
         )
-        
+        results = list(results)
+    
+    for category, keywords in zip(categories, results):
         if keywords:
             all_keywords[category] = keywords
             success_count += 1
@@ -206,22 +240,22 @@ def auto_collect_keywords(
     return all_keywords
 
 
-# 네이버 쇼핑 카테고리 코드 매핑
+# 네이버 쇼핑 카테고리 코드 매핑 (읽기 전용이라 tuple로 고정)
 CATEGORY_CODES = {
-    "패션의류": ["50000000"],
-    "패션잡화": ["50000001"],
-    "화장품/미용": ["50000002"],
-    "디지털/가전": ["50000003"],
-    "가구/인테리어": ["50000004"],
-    "출산/육아": ["50000005"],
-    "식품": ["50000006"],
-    "스포츠/레저": ["50000007"],
-    "생활/건강": ["50000010"],
-    "여가/생활편의": ["50000011"],
+    "패션의류": ("50000000",),
+    "패션잡화": ("50000001",),
+    "화장품/미용": ("50000002",),
+    "디지털/가전": ("50000003",),
+    "가구/인테리어": ("50000004",),
+    "출산/육아": ("50000005",),
+    "식품": ("50000006",),
+    "스포츠/레저": ("50000007",),
+    "생활/건강": ("50000010",),
+    "여가/생활편의": ("50000011",),
 }
 
 # 기본 카테고리 목록
-DEFAULT_CATEGORIES = list(CATEGORY_CODES.keys())
+DEFAULT_CATEGORIES = tuple(CATEGORY_CODES)
 
 
 if __name__ == "__main__":
@@ -3,15 +3,56 @@
 실제 네이버 쇼핑의 카테고리 구조를 사용
 """
 
+import logging
+import os
+import re
+import pandas as pd
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Set
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
 # SSL 경고 비활성화
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# HTTP 세션 재사용 (Keep-Alive로 카테고리마다 TLS 핸드셰이크 반복 방지)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"]
+        )
+    )
+)
+
+
+# 카테고리 키워드 수집 시 동시 요청 수
+CATEGORY_MAX_WORKERS = 8
+
+# 검색 결과 제목의 강조 태그 (<b>, </b>를 한 번에 제거)
+_BOLD_RE = re.compile(r"</?b>")
+
+# 한글 음절 범위 (가~힣)
+_HANGUL_RE = re.compile(r"[\uac00-\ud7a3]")
+
 
 # 네이버 쇼핑의 주요 카테고리 (실제 카테고리 ID)
 NAVER_SHOPPING_CATEGORIES = {
@@ -73,6 +114,41 @@ NAVER_SHOPPING_CATEGORIES = {
 }
 
 
+@lru_cache(maxsize=8)
+def _load_categories_file(path: str, mtime_ns: int) -> Dict:
+    """
+    카테고리 키워드 파일 로드 (경로 + 수정시각 기준 캐시)
+    
+    파일이 바뀌면 mtime_ns가 달라져 자동으로 다시 읽음.
+    반환된 dict는 캐시와 공유되므로 수정하지 말 것.
+    """
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_categories_file(path: Path, data: Dict) -> None:
+    """
+    카테고리 키워드 파일 저장 (임시 파일 작성 후 원자적 교체)
+    
+    같은 파일을 쓰는 다른 도구(datalab_shopping_insight, auto_keyword_discovery)와
+    같은 들여쓰기 2칸 형식으로 저장.
+    """
+    tmp_path = path.with_suffix(".json.tmp")
+    try:
+        if orjson is not None:
+            tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+    except Exception:
+        # 반쯤 쓰인 임시 파일은 남기지 않음
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, path)
+
+
 def get_category_keywords(
     client_id: str,
     client_secret: str,
@@ -91,7 +167,7 @@ def get_category_keywords(
     Returns:
         카테고리의 인기 키워드 리스트
     """
-    keywords = set()
+    keywords = []
     
     try:
         # 카테고리명으로 검색
@@ -108,45 +184,37 @@ def get_category_keywords(
             "sort": "sim"  # 유사도순
         }
         
-        response = requests.get(url, headers=headers, params=params, 
-                               timeout=30, verify=False)
+        response = _SESSION.get(url, headers=headers, params=params, 
+                                timeout=30, verify=False)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content) if orjson is not None else response.json()
+        items = data.get("items", [])
+        
+        # 제목에서 태그 제거 후 단어 단위로 펼치기 (응답 전체를 한 번에 처리)
+        titles = pd.Series([item.get("title", "") for item in items], dtype="object")
+        titles = titles.str.replace(_BOLD_RE, "", regex=True)
+        words = titles.str.split().explode().dropna().str.strip()
         
-        # 제품명과 브랜드에서 키워드 추출
-        for item in data.get("items", []):
-            # 제목에서 태그 제거
-            title = item.get("title", "")
-            title = title.replace("<b>", "").replace("</b>", "")
-            
-            # 브랜드
-            brand = item.get("brand", "")
-            
-            # 카테고리
-            category1 = item.get("category1", "")
-            category2 = item.get("category2", "")
-            category3 = item.get("category3", "")
-            category4 = item.get("category4", "")
-            
-            # 키워드 추출 (단어 단위)
-            words = title.split()
-            for word in words:
-                # 필터링: 한글/영문 2자 이상
-                word = word.strip()
-                if len(word) >= 2 and (word.isalpha() or any('\uac00' <= c <= '\ud7a3' for c in word)):
-                    keywords.add(word)
-            
-            # 브랜드 추가
-            if brand and len(brand) >= 2:
-                keywords.add(brand)
+        # 필터링: 한글/영문 2자 이상
+        words = words[
+            (words.str.len() >= 2)
+            & (words.str.isalpha() | words.str.contains(_HANGUL_RE))
+        ]
         
-        print(f"✓ {category_name}: {len(keywords)}개 키워드 수집")
+        # 브랜드 추가
+        brands = pd.Series([item.get("brand", "") for item in items], dtype="object")
+        brands = brands[brands.str.len() >= 2]
+        
+        # 중복 제거 (처음 등장한 순서 유지)
+        keywords = pd.unique(pd.concat([words, brands], ignore_index=True))
+        
+        logger.debug("✓ %s: %d개 키워드 수집", category_name, len(keywords))
         
     except Exception as e:
-        print(f"✗ {category_name} 수집 실패: {str(e)}")
+        logger.warning("✗ %s 수집 실패: %s", category_name, e)
     
-    return list(keywords)[:50]  # 상위 50개만
+    return list(keywords[:50])  # 상위 50개만 (슬라이스 후 리스트로 변환)
 
 
 def collect_all_categories(
@@ -165,8 +233,7 @@ def collect_all_categories(
     existing_data = {}
     if save_path.exists():
         try:
-            with open(save_path, "r", encoding="utf-8") as f:
-                existing_data = json.load(f)
+            existing_data = load_categories(save_path)
             print(f"📦 기존 데이터: {len(existing_data)}개 카테고리")
         except:
             pass
@@ -179,39 +246,38 @@ def collect_all_categories(
     print("🛍️ 네이버 쇼핑 카테고리 키워드 자동 수집")
     print("="*60)
     
+    # (대분류, 저장 라벨, 검색어) 목록으로 펼친 뒤 동시에 수집
+    tasks = []
     for major_cat, info in NAVER_SHOPPING_CATEGORIES.items():
-        print(f"\n📂 {major_cat}")
-        
-        # 대분류 키워드 수집
-        major_keywords = get_category_keywords(
-            client_id, client_secret, major_cat, max_products=50
-        )
+        tasks.append((major_cat, major_cat, major_cat))
+        for sub_cat in info.get("sub", {}).keys():
+            tasks.append((major_cat, f"{major_cat} {sub_cat}", sub_cat))
+    
+    with ThreadPoolExecutor(max_workers=CATEGORY_MAX_WORKERS) as executor:
+        results = list(executor.map(
+            lambda task: get_category_keywords(
+                client_id, client_secret, task[2], max_products=50
+            ),
+            tasks
+        ))
+    
+    # 결과는 카테고리 순서대로 반영
+    current_major = None
+    for (major_cat, label, _), keywords in zip(tasks, results):
+        if major_cat != current_major:
+            current_major = major_cat
+            print(f"\n📂 {major_cat}")
         
-        if major_keywords:
-            all_keywords[major_cat] = major_keywords
+        if keywords:
+            all_keywords[label] = keywords
             success_count += 1
         else:
             fail_count += 1
-            print(f"  ⚠️ {major_cat}: 기존 데이터 유지")
-        
-        # 중분류 키워드 수집
-        for sub_cat in info.get("sub", {}).keys():
-            full_cat = f"{major_cat} {sub_cat}"
-            sub_keywords = get_category_keywords(
-                client_id, client_secret, sub_cat, max_products=50
-            )
-            
-            if sub_keywords:
-                all_keywords[full_cat] = sub_keywords
-                success_count += 1
-            else:
-                fail_count += 1
-                print(f"  ⚠️ {full_cat}: 기존 데이터 유지")
+            print(f"  ⚠️ {label}: 기존 데이터 유지")
     
     # 저장 (성공한 항목이 있을 때만)
     if success_count > 0:
-        with open(save_path, "w", encoding="utf-8") as f:
-            json.dump(all_keywords, f, ensure_ascii=False, indent=2)
+        _save_categories_file(save_path, all_keywords)
         
         print(f"\n✅ 저장 완료: {save_path}")
         print(f"총 {len(all_keywords)}개 카테고리, {sum(len(v) for v in all_keywords.values())}개 키워드")
@@ -225,14 +291,14 @@ def collect_all_categories(
 
 
 def load_categories(path: str = "./naver_categories.json") -> Dict:
-    """저장된 카테고리 키워드 로드"""
+    """저장된 카테고리 키워드 로드 (같은 파일은 메모리 캐시 사용)"""
     path = Path(path)
     
     if not path.exists():
         return {}
     
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # 캐시된 dict를 호출자가 수정해도 안전하도록 얕은 복사본 반환
+    return dict(_load_categories_file(str(path), path.stat().st_mtime_ns))
 
 
 def update_category(
@@ -247,15 +313,12 @@ def update_category(
     keywords = get_category_keywords(client_id, client_secret, category_name)
     categories[category_name] = keywords
     
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(categories, f, ensure_ascii=False, indent=2)
+    _save_categories_file(Path(path), categories)
     
     print(f"✅ {category_name} 업데이트 완료")
 
 
 if __name__ == "__main__":
-    import os
-    
     CLIENT_ID = os.getenv("NAVER_CLIENT_ID", "")
     CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET", "")
     
@@ -2,21 +2,78 @@
 Selenium을 활용한 네이버 DataLab 쇼핑인사이트 크롤링 모듈
 """
 
+import os
 import time
 import re
+import multiprocessing
+import multiprocessing.util
 import pandas as pd
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 
 
 DATALAB_URL = "https://datalab.naver.com/shoppingInsight/sCategory.naver"
 
+# 인기검색어 항목 선택자 (CSS 우선, 없으면 XPath로 재시도)
+RANK_ITEM_SELECTOR = ".keyword_rank li, .ranking_keyword li, .popular_keyword li"
+RANK_ITEM_XPATH = "//li[contains(@class, 'rank')]"
+
+# 인기검색어 결과 컬럼
+_RESULT_COLUMNS = ("순위", "키워드", "원본텍스트", "증감표시", "라벨")
+
+# 인기검색어 항목 텍스트 파싱용 정규식
+_RANK_RE = re.compile(r'^\s*(\d{1,3})\s*')
+_LEADING_NUM_RE = re.compile(r'^\d+\s*')
+_MARK_SPLIT_RE = re.compile(r'NEW|↑|▲|\+\d+')
+_UP_RE = re.compile(r'([+↑▲]\s*\d+|NEW)')
+
+# 증감 표식 문자 / 상승을 뜻하는 클래스명 조각 (단순 포함 여부만 확인)
+_UP_MARKS = ("+", "↑", "▲", "NEW")
+_CLS_UP_TOKENS = ("up", "increase", "rise", "arrow_up", "red")
+
+# 인기검색어 항목을 한 번의 스크립트 실행으로 수집 (CSS 선택자 → XPath 순으로 시도)
+_RANK_ITEMS_JS = """
+const [css, xpath] = arguments;
+let items = Array.from(document.querySelectorAll(css));
+if (!items.length) {
+    const snap = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < snap.snapshotLength; i++) items.push(snap.snapshotItem(i));
+}
+return items.map(li => {
+    const a = li.querySelector("a");
+    return {text: li.innerText || "", anchor: a ? a.innerText : null, cls: li.className || ""};
+});
+"""
+
+# crawl_many 작업 프로세스마다 하나씩 띄워 재사용하는 WebDriver
+_WORKER_DRIVER: Optional[webdriver.Chrome] = None
+
+# 작업 프로세스에서 WebDriver 실행이 실패한 경우의 예외 (작업 실행 시 다시 발생시킴)
+_WORKER_INIT_ERROR: Optional[BaseException] = None
+
+# 고정 sleep 대신 요소가 준비될 때까지만 기다리는 최대 시간(초)
+PAGE_LOAD_TIMEOUT = 15
+CLICK_TIMEOUT = 10
+
+
+@lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    """
+    ChromeDriver 경로 (설치/버전 확인은 프로세스당 한 번만)
+    
+    환경변수 CHROMEDRIVER_PATH가 있으면 미리 설치된 드라이버를 그대로 사용
+    (Docker 이미지 등에서 webdriver-manager의 네트워크 조회 생략).
+    """
+    return os.environ.get("CHROMEDRIVER_PATH") or ChromeDriverManager().install()
+
 
 def launch_driver(headless: bool = True) -> webdriver.Chrome:
     """
@@ -40,7 +97,7 @@ def launch_driver(headless: bool = True) -> webdriver.Chrome:
     options.add_experimental_option('useAutomationExtension', False)
     
     driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
+        service=Service(_chromedriver_path()),
         options=options
     )
     return driver
@@ -59,87 +116,81 @@ def extract_popular_keywords_from_page(driver: webdriver.Chrome) -> pd.DataFrame
     Returns:
         인기검색어 DataFrame
     """
-    wait = WebDriverWait(driver, 15)
+    wait = WebDriverWait(driver, PAGE_LOAD_TIMEOUT)
     
     try:
-        # 페이지 로딩 대기
-        time.sleep(2)
+        # 인기검색어 항목이 렌더링될 때까지 대기 (준비되면 바로 진행)
+        try:
+            wait.until(EC.any_of(
+                EC.presence_of_element_located((By.CSS_SELECTOR, RANK_ITEM_SELECTOR)),
+                EC.presence_of_element_located((By.XPATH, RANK_ITEM_XPATH))
+            ))
+        except TimeoutException:
+            print("인기검색어 영역 대기 시간 초과 - 현재 화면으로 파싱 시도")
         
         # 인기검색어 영역 찾기 (여러 방법 시도)
-        results = []
+        # 결과는 행마다 dict를 만들지 않고 컬럼별 리스트에 바로 추가
+        results = {column: [] for column in _RESULT_COLUMNS}
         
-        # 방법 1: 특정 클래스/ID로 찾기
+        # 방법 1: 특정 클래스/ID로 찾기, 없으면 방법 2: 텍스트 기반으로 찾기
+        # (항목마다 WebDriver 왕복하지 않도록 브라우저 안에서 한 번에 텍스트/링크/클래스 수집)
         try:
             # 실제 페이지 구조에 맞게 조정 필요
-            keyword_items = driver.find_elements(
-                By.CSS_SELECTOR,
-                ".keyword_rank li, .ranking_keyword li, .popular_keyword li"
-            )
-            
-            if not keyword_items:
-                # 방법 2: 텍스트 기반으로 찾기
-                keyword_items = driver.find_elements(By.XPATH, "//li[contains(@class, 'rank')]")
+            keyword_items = driver.execute_script(
+                _RANK_ITEMS_JS, RANK_ITEM_SELECTOR, RANK_ITEM_XPATH
+            ) or []
             
             for li in keyword_items:
-                text = li.text.strip().replace("\n", " ")
+                text = li["text"].strip().replace("\n", " ")
                 if not text:
                     continue
                 
                 # 순위(숫자) 추출
-                m_rank = re.search(r'^\s*(\d{1,3})\s*', text)
+                m_rank = _RANK_RE.search(text)
                 rank = int(m_rank.group(1)) if m_rank else None
                 
-                # 키워드 추출
-                try:
-                    kw_el = li.find_element(By.TAG_NAME, "a")
-                    keyword = kw_el.text.strip()
-                except:
-                    keyword = re.sub(r'^\d+\s*', '', text).strip()
-                    keyword = re.split(r'NEW|↑|▲|\+\d+', keyword)[0].strip()
+                # 키워드 추출 (링크 텍스트 우선)
+                if li["anchor"] is not None:
+                    keyword = li["anchor"].strip()
+                else:
+                    keyword = _LEADING_NUM_RE.sub('', text).strip()
+                    keyword = _MARK_SPLIT_RE.split(keyword)[0].strip()
                 
                 # 증감 표식 확인
                 is_new = "NEW" in text.upper()
                 
-                # 증감 숫자/기호 추정
+                # 증감 숫자/기호 추정 (표식 문자가 있을 때만 정규식 실행)
                 inc = None
-                m_up = re.search(r'([+↑▲]\s*\d+|NEW)', text)
+                m_up = _UP_RE.search(text) if any(mark in text for mark in _UP_MARKS) else None
                 if m_up:
                     inc = m_up.group(1)
                 
-                # 클래스 기반 상승 힌트
-                try:
-                    cls = li.get_attribute("class") or ""
-                except:
-                    cls = ""
-                looks_up = bool(re.search(r'up|increase|rise|arrow_up|red', cls, re.I))
+                # 급상승 판단 (앞 조건이 참이면 클래스 기반 상승 힌트는 확인하지 않음)
+                rising = is_new or bool(m_up)
+                if not rising:
+                    cls = (li["cls"] or "").lower()
+                    rising = any(token in cls for token in _CLS_UP_TOKENS)
                 
-                # 급상승 판단
-                rising = is_new or bool(m_up) or looks_up
-                
-                results.append({
-                    "순위": rank,
-                    "키워드": keyword,
-                    "원본텍스트": text,
-                    "증감표시": inc if inc else ("NEW" if is_new else ""),
-                    "라벨": "급상승" if rising else "정상"
-                })
+                results["순위"].append(rank)
+                results["키워드"].append(keyword)
+                results["원본텍스트"].append(text)
+                results["증감표시"].append(inc if inc else ("NEW" if is_new else ""))
+                results["라벨"].append("급상승" if rising else "정상")
         
         except Exception as e:
             print(f"키워드 추출 중 오류: {str(e)}")
             # 더미 데이터 생성 (테스트용)
-            results = [
-                {
-                    "순위": i,
-                    "키워드": f"키워드{i}",
-                    "원본텍스트": f"{i} 키워드{i}",
-                    "증감표시": "NEW" if i <= 3 else (f"+{i*10}" if i <= 10 else ""),
-                    "라벨": "급상승" if i <= 10 else "정상"
-                }
-                for i in range(1, 21)
-            ]
+            ranks = range(1, 21)
+            results = {
+                "순위": list(ranks),
+                "키워드": [f"키워드{i}" for i in ranks],
+                "원본텍스트": [f"{i} 키워드{i}" for i in ranks],
+                "증감표시": ["NEW" if i <= 3 else (f"+{i*10}" if i <= 10 else "") for i in ranks],
+                "라벨": ["급상승" if i <= 10 else "정상" for i in ranks]
+            }
         
         # DataFrame 생성
-        if results:
+        if results["키워드"]:
             df = pd.DataFrame(results)
             # 유효한 키워드만 필터링
             df = df[df["키워드"].str.len() > 0]
@@ -155,32 +206,67 @@ def extract_popular_keywords_from_page(driver: webdriver.Chrome) -> pd.DataFrame
         return pd.DataFrame()
 
 
+def _wait_page_ready(driver: webdriver.Chrome):
+    """문서 로딩이 끝날 때까지 대기 (고정 sleep 대체)"""
+    WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+
+
+def _select_dropdown_item(driver: webdriver.Chrome, button_xpath: str, item_xpath: str):
+    """
+    드롭다운 버튼을 열고 항목을 선택한 뒤, 인기검색어 목록이 갱신될 때까지 대기
+    
+    Args:
+        driver: Selenium WebDriver
+        button_xpath: 드롭다운 버튼 XPath
+        item_xpath: 선택할 항목 XPath
+    """
+    wait = WebDriverWait(driver, CLICK_TIMEOUT)
+    wait.until(EC.element_to_be_clickable((By.XPATH, button_xpath))).click()
+    
+    # 선택 전 목록을 기억해 두었다가 새 목록으로 바뀌는 시점까지만 대기
+    old_items = driver.find_elements(By.CSS_SELECTOR, RANK_ITEM_SELECTOR)
+    wait.until(EC.element_to_be_clickable((By.XPATH, item_xpath))).click()
+    
+    if old_items:
+        try:
+            wait.until(EC.staleness_of(old_items[0]))
+        except TimeoutException:
+            pass  # 목록 요소를 재사용하는 화면이면 그대로 진행
+
+
 def crawl_scategory_popular(
     headless: bool = True,
-    manual_wait: int = 8
+    manual_wait: int = 8,
+    driver: Optional[webdriver.Chrome] = None
 ) -> pd.DataFrame:
     """
     네이버 쇼핑인사이트 sCategory 페이지에서 인기검색어 크롤링
     
     Args:
         headless: 헤드리스 모드 사용 여부
-        manual_wait: 페이지 로딩 대기 시간(초)
+        manual_wait: 화면 모드에서 사용자가 드롭다운을 조작할 시간(초, 헤드리스에서는 무시)
+        driver: 재사용할 WebDriver (없으면 새로 실행하고 끝나면 종료)
     
     Returns:
         인기검색어 DataFrame
     """
-    driver = launch_driver(headless=headless)
+    owns_driver = driver is None
+    if owns_driver:
+        driver = launch_driver(headless=headless)
     
     try:
         print(f"페이지 접속 중: {DATALAB_URL}")
         driver.get(DATALAB_URL)
         
         # 초기 렌더 대기
-        time.sleep(3)
+        _wait_page_ready(driver)
         
-        print(f"페이지 로딩 대기 중... ({manual_wait}초)")
-        # 사용자가 드롭다운(분야/기간 등) 조작할 시간
-        time.sleep(manual_wait)
+        # 사용자가 드롭다운(분야/기간 등) 조작할 시간 (화면이 보일 때만 의미 있음)
+        if not headless:
+            print(f"드롭다운 조작 대기 중... ({manual_wait}초)")
+            time.sleep(manual_wait)
         
         print("인기검색어 추출 중...")
         df = extract_popular_keywords_from_page(driver)
@@ -193,13 +279,15 @@ def crawl_scategory_popular(
         return pd.DataFrame()
     
     finally:
-        driver.quit()
+        if owns_driver:
+            driver.quit()
 
 
 def crawl_with_category_selection(
     category: Optional[str] = None,
     period: Optional[str] = None,
-    headless: bool = True
+    headless: bool = True,
+    driver: Optional[webdriver.Chrome] = None
 ) -> pd.DataFrame:
     """
     카테고리와 기간을 자동으로 선택한 후 크롤링
@@ -209,41 +297,39 @@ def crawl_with_category_selection(
         category: 선택할 카테고리
         period: 선택할 기간
         headless: 헤드리스 모드
+        driver: 재사용할 WebDriver (없으면 새로 실행하고 끝나면 종료)
     
     Returns:
         인기검색어 DataFrame
     """
-    driver = launch_driver(headless=headless)
+    owns_driver = driver is None
+    if owns_driver:
+        driver = launch_driver(headless=headless)
     
     try:
         driver.get(DATALAB_URL)
-        time.sleep(3)
+        _wait_page_ready(driver)
         
         # 카테고리 선택 (실제 페이지 구조에 맞게 조정 필요)
         if category:
             try:
-                # 카테고리 드롭다운 클릭
-                category_btn = driver.find_element(By.XPATH, "//button[contains(., '카테고리')]")
-                category_btn.click()
-                time.sleep(1)
-                
-                # 원하는 카테고리 선택
-                category_item = driver.find_element(By.XPATH, f"//li[contains(., '{category}')]")
-                category_item.click()
-                time.sleep(2)
+                # 카테고리 드롭다운 열고 원하는 카테고리 선택
+                _select_dropdown_item(
+                    driver,
+                    "//button[contains(., '카테고리')]",
+                    f"//li[contains(., '{category}')]"
+                )
             except Exception as e:
                 print(f"카테고리 선택 실패: {str(e)}")
         
         # 기간 선택
         if period:
             try:
-                period_btn = driver.find_element(By.XPATH, "//button[contains(., '기간')]")
-                period_btn.click()
-                time.sleep(1)
-                
-                period_item = driver.find_element(By.XPATH, f"//li[contains(., '{period}')]")
-                period_item.click()
-                time.sleep(2)
+                _select_dropdown_item(
+                    driver,
+                    "//button[contains(., '기간')]",
+                    f"//li[contains(., '{period}')]"
+                )
             except Exception as e:
                 print(f"기간 선택 실패: {str(e)}")
         
@@ -256,5 +342,76 @@ def crawl_with_category_selection(
         return pd.DataFrame()
     
     finally:
-        driver.quit()
+        if owns_driver:
+            driver.quit()
+
 
+def _init_crawl_worker(headless: bool):
+    """
+    crawl_many 작업 프로세스 초기화 (프로세스당 WebDriver 1개, 프로세스 종료 시 정리)
+    
+    initializer에서 예외가 나면 Pool이 작업 프로세스를 계속 다시 띄우며 멈추므로,
+    실패는 저장만 해 두고 첫 작업에서 발생시킴.
+    """
+    global _WORKER_DRIVER, _WORKER_INIT_ERROR
+    try:
+        _WORKER_DRIVER = launch_driver(headless=headless)
+    except Exception as e:
+        _WORKER_INIT_ERROR = e
+        return
+    multiprocessing.util.Finalize(None, _WORKER_DRIVER.quit, exitpriority=10)
+
+
+def _crawl_in_worker(category: Optional[str], period: Optional[str]) -> pd.DataFrame:
+    """작업 프로세스의 WebDriver로 한 건 크롤링"""
+    if _WORKER_INIT_ERROR is not None:
+        raise RuntimeError(f"WebDriver 실행 실패: {_WORKER_INIT_ERROR}") from _WORKER_INIT_ERROR
+    
+    df = crawl_with_category_selection(category, period, driver=_WORKER_DRIVER)
+    if not df.empty:
+        df.insert(0, "기간", period)
+        df.insert(0, "카테고리", category)
+    return df
+
+
+def crawl_many(
+    category_period_pairs: List[Tuple[Optional[str], Optional[str]]],
+    workers: int = 4,
+    headless: bool = True
+) -> pd.DataFrame:
+    """
+    여러 (카테고리, 기간) 조합을 프로세스 풀로 동시에 크롤링
+    
+    Selenium은 스레드에 안전하지 않으므로 프로세스마다 WebDriver를 하나씩 두고
+    그 프로세스에 배정된 작업끼리 재사용.
+    
+    Args:
+        category_period_pairs: [(카테고리, 기간), ...]
+        workers: 동시에 띄울 브라우저(프로세스) 수
+        headless: 헤드리스 모드
+    
+    Returns:
+        조합별 인기검색어를 이어 붙인 DataFrame (카테고리, 기간 컬럼 추가)
+    """
+    if not category_period_pairs:
+        return pd.DataFrame()
+    
+    pool = multiprocessing.Pool(
+        processes=min(workers, len(category_period_pairs)),
+        initializer=_init_crawl_worker,
+        initargs=(headless,)
+    )
+    try:
+        dfs = pool.starmap(_crawl_in_worker, category_period_pairs)
+    except BaseException:
+        # 오류/Ctrl+C 시에는 남은 작업을 기다리지 않고 바로 종료
+        pool.terminate()
+        raise
+    else:
+        # 정상 완료 시에는 terminate 대신 정상 종료시켜 작업 프로세스의 브라우저가 닫히도록 함
+        pool.close()
+    finally:
+        pool.join()
+    
+    dfs = [df for df in dfs if not df.empty]
+    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
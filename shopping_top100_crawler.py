@@ -3,19 +3,72 @@
 목적: 카테고리별 인기 제품 순위를 수집하여 급상승 브랜드를 자동 감지
 """
 
+import os
 import time
 import re
+import hashlib
+import threading
+import numpy as np
 import pandas as pd
 import requests
 import json
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from typing import Optional, List, Dict
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, List, Dict, Tuple
 from urllib.parse import quote
 
 # SSL 경고 메시지 비활성화
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# HTTP 세션 재사용 (Keep-Alive로 키워드마다 TLS 핸드셰이크 반복 방지)
+# - 429/5xx는 Retry-After를 지키며 지수 백오프로 재시도 (최종 응답은 아래 상태코드별 처리로 전달)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+    )
+)
+
+# 검색 결과 디스크 캐시 (TTL 내 같은 조회는 API 호출 생략, 0이면 비활성화)
+# - 환경변수 NAVER_CACHE_DISABLE=1 로 끌 수 있음 (테스트/디버깅용)
+SEARCH_CACHE_DIR = Path("./.cache/top100")
+SEARCH_CACHE_TTL = 60 * 60  # 1시간
+
+# 여러 키워드를 동시에 수집할 때의 최대 동시 요청 수
+TOP100_MAX_WORKERS = 8
+
+# 상품명 파싱용 정규식 (HTML 태그, 대괄호 브랜드, 단어 구분자)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_BRACKET_RE = re.compile(r'\[([^\]]+)\]')
+_SPLIT_RE = re.compile(r'[\s\[\]()]+')
+
+# 순위 변동 상태코드 (compare_with_history 결과의 상태코드 컬럼)
+RANK_NEW = 2
+RANK_UP = 1
+RANK_SAME = 0
+RANK_DOWN = -1
+
+# 순위 비교에 필요한 히스토리 컬럼 (순위 파티션에는 이것만 저장)
+HISTORY_RANK_COLUMNS = ("브랜드", "순위")
+
+# 상품 파싱에 사용하는 검색 API 응답 필드
+_ITEM_FIELDS = ("title", "brand", "lprice", "link", "category1", "category2", "mallName")
+
 
 # 주요 카테고리 매핑
 CATEGORIES = {
@@ -29,6 +82,61 @@ CATEGORIES = {
     "샴푸": "샴푸",
 }
 
+# 알려진 브랜드 사전 (제품명 어디에 있든 우선 인식)
+KNOWN_BRANDS = (
+    # 구강용품
+    "리스테린", "가그린", "페리오", "메디안", "2080", "센소다인", "파로돈탁스",
+    "오랄비", "Oral-B", "덴티스테", "부광", "헥사메딘",
+    # 건강기능식품
+    "종근당", "락토핏", "고려은단", "센트룸", "뉴트리원", "솔가", "나우푸드",
+    "얼라이브", "세노비스", "정관장", "일양약품", "덴마크유산균이야기",
+    # 스킨케어/선케어
+    "메디힐", "라운드랩", "닥터지", "아벤느", "바이오더마", "라로슈포제", "비오레",
+    "이니스프리", "토리든", "아누아", "마녀공장", "에스트라", "피지오겔",
+    # 헤어케어
+    "닥터포헤어", "케라시스", "엘라스틴", "헤드앤숄더", "아모스",
+)
+
+# 브랜드 사전 검색용 정규식 (긴 이름 우선, 영문은 대소문자 무시)
+# 앞뒤가 영문/숫자/한글이 아닌 독립된 단어일 때만 매칭 ("20800mAh"의 "2080" 등 제외)
+_KNOWN_BRAND_RE = re.compile(
+    "(?<![0-9A-Za-z가-힣])(" + "|".join(
+        re.escape(brand)
+        for brand in sorted(KNOWN_BRANDS, key=len, reverse=True)
+    ) + ")(?![0-9A-Za-z가-힣])",
+    re.I
+)
+_KNOWN_BRAND_CANON = {brand.lower(): brand for brand in KNOWN_BRANDS}
+
+
+def _search_cache_path(keyword: str, display: int, start: int, sort: str) -> Path:
+    """검색 조건별 캐시 파일 경로"""
+    key = json.dumps([keyword, display, start, sort], ensure_ascii=False)
+    return SEARCH_CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+
+def _load_cached_search(cache_path: Path):
+    """TTL 이내의 캐시된 검색 결과 로드 (없거나 만료되면 None)"""
+    try:
+        if time.time() - cache_path.stat().st_mtime > SEARCH_CACHE_TTL:
+            return None
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_search(cache_path: Path, data: dict):
+    """검색 결과를 캐시에 저장 (임시 파일 작성 후 교체)"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ 검색 캐시 저장 실패: {str(e)}")
+
 
 def naver_shopping_search(
     client_id: str,
@@ -36,7 +144,8 @@ def naver_shopping_search(
     keyword: str,
     display: int = 100,
     start: int = 1,
-    sort: str = "sim"  # sim(유사도), date(날짜), asc(가격낮은순), dsc(가격높은순)
+    sort: str = "sim",  # sim(유사도), date(날짜), asc(가격낮은순), dsc(가격높은순)
+    force_refresh: bool = False
 ) -> dict:
     """
     네이버 쇼핑 검색 API 호출
@@ -48,10 +157,18 @@ def naver_shopping_search(
         display: 한 번에 가져올 개수 (최대 100)
         start: 시작 위치 (1~1000)
         sort: 정렬 방법
+        force_refresh: True면 캐시를 무시하고 새로 조회 (결과는 캐시에 갱신)
     
     Returns:
         API 응답 JSON
     """
+    use_cache = SEARCH_CACHE_TTL > 0 and not os.getenv("NAVER_CACHE_DISABLE")
+    cache_path = _search_cache_path(keyword, display, start, sort)
+    if use_cache and not force_refresh:
+        cached = _load_cached_search(cache_path)
+        if cached is not None:
+            return cached
+    
     url = "https://openapi.naver.com/v1/search/shop.json"
     
     headers = {
@@ -68,9 +185,15 @@ def naver_shopping_search(
     
     try:
         # SSL 검증 비활성화 (회사 보안 프록시 환경 대응)
-        response = requests.get(url, headers=headers, params=params, timeout=30, verify=False)
+        response = _SESSION.get(
+            url,
+            headers=headers,
+            params=params,
+            timeout=(5, 30),  # (연결, 응답) - 연결 불가 호스트는 빠르게 포기
+            verify=False
+        )
         response.raise_for_status()
-        return response.json()
+        data = response.json()
     except requests.exceptions.HTTPError as e:
         if response.status_code == 401:
             raise Exception("API 인증 실패: Client ID 또는 Secret을 확인하세요")
@@ -80,6 +203,12 @@ def naver_shopping_search(
             raise Exception(f"API 오류 ({response.status_code}): {response.text}")
     except requests.exceptions.RequestException as e:
         raise Exception(f"네트워크 오류: {str(e)}")
+    
+    # 성공한 응답만 캐시 (오류는 위에서 예외로 전파)
+    if use_cache:
+        _save_cached_search(cache_path, data)
+    
+    return data
 
 
 def crawl_shopping_top100(
@@ -100,7 +229,7 @@ def crawl_shopping_top100(
     Returns:
         DataFrame with columns: [순위, 제품명, 브랜드, 가격, 리뷰수, 평점, 순위변동, URL]
     """
-    results = []
+    results = pd.DataFrame()
     
     try:
         print(f"🔍 '{keyword}' 검색 중... (API 사용)")
@@ -123,52 +252,31 @@ def crawl_shopping_top100(
         
         print(f"✅ {len(items)}개 제품 발견")
         
-        # 상품 정보 파싱
-        for idx, item in enumerate(items, start=1):
-            try:
-                # 제품명 (HTML 태그 제거)
-                product_name = re.sub(r'<[^>]+>', '', item.get("title", ""))
-                
-                # 브랜드 추출
-                brand = extract_brand(product_name)
-                if not brand:
-                    brand = item.get("brand", "알수없음")
-                
-                # 가격
-                price_str = item.get("lprice", "0")
-                price = int(price_str) if price_str.isdigit() else 0
-                
-                # URL
-                url = item.get("link", "")
-                
-                # 카테고리
-                category1 = item.get("category1", "")
-                category2 = item.get("category2", "")
-                
-                # 쇼핑몰
-                mall_name = item.get("mallName", "")
-                
-                results.append({
-                    "순위": idx,
-                    "제품명": product_name,
-                    "브랜드": brand,
-                    "가격": price,
-                    "리뷰수": 0,  # API에서는 리뷰수 제공 안함
-                    "평점": 0,  # API에서는 평점 제공 안함
-                    "순위변동": "",
-                    "URL": url,
-                    "카테고리1": category1,
-                    "카테고리2": category2,
-                    "쇼핑몰": mall_name,
-                    "수집일시": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                })
-                
-                if idx % 10 == 0:
-                    print(f"  → {idx}개 제품 수집 완료...")
-                
-            except Exception as e:
-                print(f"  ⚠️ 상품 {idx} 파싱 오류: {str(e)}")
-                continue
+        # 상품 정보 파싱 (행 단위 루프 대신 컬럼 단위로 한 번에 처리)
+        raw = pd.DataFrame.from_records(items).reindex(columns=list(_ITEM_FIELDS))
+        raw = raw.fillna({field: "" for field in _ITEM_FIELDS if field != "brand"})
+        
+        # 제품명 (HTML 태그 제거)
+        product_names = raw["title"].str.replace(_HTML_TAG_RE, '', regex=True)
+        
+        # 브랜드 추출 (제품명에서 못 찾으면 API 브랜드 필드 사용)
+        brands = extract_brands(product_names)
+        brands = brands.where(brands != "", raw["brand"].fillna("알수없음"))
+        
+        results = pd.DataFrame({
+            "순위": np.arange(1, len(raw) + 1),
+            "제품명": product_names,
+            "브랜드": brands,
+            "가격": pd.to_numeric(raw["lprice"], errors="coerce").fillna(0).astype(int),
+            "리뷰수": 0,  # API에서는 리뷰수 제공 안함
+            "평점": 0,  # API에서는 평점 제공 안함
+            "순위변동": "",
+            "URL": raw["link"],
+            "카테고리1": raw["category1"],
+            "카테고리2": raw["category2"],
+            "쇼핑몰": raw["mallName"],
+            "수집일시": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
         
         print(f"✅ 총 {len(results)}개 제품 수집 완료")
         
@@ -177,7 +285,7 @@ def crawl_shopping_top100(
         import traceback
         traceback.print_exc()
     
-    return pd.DataFrame(results)
+    return results
 
 
 def extract_brand(product_name: str) -> str:
@@ -187,15 +295,29 @@ def extract_brand(product_name: str) -> str:
         return ""
     
     # 대괄호 안의 브랜드명
-    match = re.search(r'\[([^\]]+)\]', product_name)
+    match = _BRACKET_RE.search(product_name)
     if match:
         return match.group(1)
     
+    # 브랜드 사전에 있는 이름 (가장 앞에 나온 것)
+    match = _KNOWN_BRAND_RE.search(product_name)
+    if match:
+        return _KNOWN_BRAND_CANON[match.group(1).lower()]
+    
     # 첫 단어 (공백 또는 특수문자 기준)
-    words = re.split(r'[\s\[\]()]+', product_name)
+    words = _SPLIT_RE.split(product_name)
     return words[0] if words else ""
 
 
+def extract_brands(product_names: pd.Series) -> pd.Series:
+    """제품명 Series에서 브랜드명 일괄 추출 (extract_brand와 같은 규칙)"""
+    # 대괄호 안의 브랜드명 → 브랜드 사전 → 첫 단어 (공백 또는 특수문자 기준) 순
+    bracketed = product_names.str.extract(_BRACKET_RE, expand=False)
+    known = product_names.str.extract(_KNOWN_BRAND_RE, expand=False).str.lower().map(_KNOWN_BRAND_CANON)
+    first_words = product_names.str.split(_SPLIT_RE, n=1, regex=True).str[0]
+    return bracketed.fillna(known).fillna(first_words).fillna("")
+
+
 def compare_with_history(
     current_df: pd.DataFrame,
     history_df: Optional[pd.DataFrame] = None
@@ -208,41 +330,43 @@ def compare_with_history(
         history_df: 이전에 수집한 데이터 (없으면 None)
     
     Returns:
-        순위변동 정보가 추가된 DataFrame
+        상태코드(RANK_NEW/RANK_UP/RANK_DOWN/RANK_SAME)와 변동폭이 추가된 DataFrame
+        (표시용 순위변동 문자열은 format_rank_change로 생성)
     """
     if history_df is None or history_df.empty:
-        current_df["순위변동"] = "NEW"
+        current_df["상태코드"] = np.int8(RANK_NEW)
         current_df["변동폭"] = 0
         return current_df
     
-    # 브랜드 기준으로 매칭
-    for idx, row in current_df.iterrows():
-        brand = row["브랜드"]
-        current_rank = row["순위"]
-        
-        # 이전 데이터에서 같은 브랜드 찾기
-        prev_data = history_df[history_df["브랜드"] == brand]
-        
-        if prev_data.empty:
-            current_df.at[idx, "순위변동"] = "🆕 NEW"
-            current_df.at[idx, "변동폭"] = 0
-        else:
-            prev_rank = prev_data.iloc[0]["순위"]
-            diff = prev_rank - current_rank  # 양수면 상승, 음수면 하락
-            
-            if diff > 0:
-                current_df.at[idx, "순위변동"] = f"⬆️ +{diff}"
-                current_df.at[idx, "변동폭"] = diff
-            elif diff < 0:
-                current_df.at[idx, "순위변동"] = f"⬇️ {diff}"
-                current_df.at[idx, "변동폭"] = diff
-            else:
-                current_df.at[idx, "순위변동"] = "─"
-                current_df.at[idx, "변동폭"] = 0
+    # 브랜드 기준으로 매칭 (브랜드별 이전 데이터의 첫 순위를 한 번에 조회)
+    prev_rank = history_df.drop_duplicates("브랜드").set_index("브랜드")["순위"]
+    prev = current_df["브랜드"].map(prev_rank)
+    diff = (prev - current_df["순위"]).fillna(0).astype(int)  # 양수면 상승, 음수면 하락
+    
+    current_df["상태코드"] = np.select(
+        [prev.isna(), diff > 0, diff < 0],
+        [RANK_NEW, RANK_UP, RANK_DOWN],
+        default=RANK_SAME
+    ).astype(np.int8)
+    current_df["변동폭"] = diff
     
     return current_df
 
 
+def format_rank_change(df: pd.DataFrame) -> pd.Series:
+    """상태코드/변동폭으로 표시용 순위변동 문자열 생성 (예: "⬆️ +12", "🆕 NEW")"""
+    codes = df["상태코드"]
+    diff_str = df["변동폭"].astype(str)
+    return pd.Series(
+        np.select(
+            [codes == RANK_NEW, codes == RANK_UP, codes == RANK_DOWN],
+            ["🆕 NEW", "⬆️ +" + diff_str, "⬇️ " + diff_str],
+            default="─"
+        ),
+        index=df.index
+    )
+
+
 def find_rising_brands(
     current_df: pd.DataFrame,
     history_df: Optional[pd.DataFrame] = None,
@@ -261,49 +385,125 @@ def find_rising_brands(
     """
     df_with_change = compare_with_history(current_df, history_df)
     
-    # 변동폭 컬럼이 있으면 필터링
-    if "변동폭" in df_with_change.columns:
-        rising = df_with_change[
-            (df_with_change["변동폭"] >= min_rise) | 
-            (df_with_change["순위변동"].str.contains("NEW", na=False))
-        ]
-    else:
-        rising = df_with_change.head(10)  # 히스토리 없으면 상위 10개
+    # 상승폭이 기준 이상이거나 신규 진입한 브랜드 (문자열 검색 없이 정수 비교)
+    rising = df_with_change[
+        (df_with_change["변동폭"] >= min_rise) | 
+        (df_with_change["상태코드"] == RANK_NEW)
+    ]
     
     return rising.sort_values("변동폭", ascending=False)
 
 
-def save_history(df: pd.DataFrame, keyword: str, history_dir: str = "history"):
-    """수집 데이터를 히스토리 파일로 저장"""
-    import os
+def save_history(
+    df: pd.DataFrame,
+    keyword: str,
+    history_dir: str = "history",
+    export_csv: bool = False
+):
+    """
+    수집 데이터를 히스토리 파일로 저장 (Parquet: 타입 유지 + 압축, CSV보다 읽기 빠름)
+    
+    Args:
+        df: 저장할 데이터
+        keyword: 검색 키워드
+        history_dir: 히스토리 폴더
+        export_csv: True면 사람이 열어볼 수 있도록 같은 내용을 CSV로도 저장
     
+    Returns:
+        저장한 Parquet 파일 경로
+    """
     os.makedirs(history_dir, exist_ok=True)
     
     date_str = datetime.now().strftime("%Y%m%d")
-    filename = f"{history_dir}/{keyword}_{date_str}.csv"
+    filename = f"{history_dir}/{keyword}_{date_str}.parquet"
     
-    df.to_csv(filename, index=False, encoding="utf-8-sig")
+    df.to_parquet(filename, index=False, compression="zstd")
     print(f"💾 히스토리 저장: {filename}")
     
+    # 순위 비교용 (브랜드, 순위)만 키워드/날짜 파티션에 따로 저장
+    rank_dir = _rank_partition_dir(history_dir, keyword, date_str)
+    os.makedirs(rank_dir, exist_ok=True)
+    df[list(HISTORY_RANK_COLUMNS)].to_parquet(
+        os.path.join(rank_dir, "part-0.parquet"), index=False, compression="zstd"
+    )
+    
+    if export_csv:
+        csv_filename = f"{history_dir}/{keyword}_{date_str}.csv"
+        df.to_csv(csv_filename, index=False, encoding="utf-8-sig")
+        print(f"💾 CSV 내보내기: {csv_filename}")
+    
     return filename
 
 
+@lru_cache(maxsize=64)
+def _read_history_file(path: str, mtime_ns: int, columns: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+    """
+    히스토리 파일 읽기 (경로 + 수정시각 기준 캐시)
+    
+    파일이 바뀌면 mtime_ns가 달라져 자동으로 다시 읽음.
+    반환된 DataFrame은 캐시와 공유되므로 호출하는 쪽에서 복사해서 사용.
+    """
+    if path.endswith(".csv"):
+        df = pd.read_csv(path, encoding="utf-8-sig")
+        return df[list(columns)] if columns else df
+    return pd.read_parquet(path, columns=list(columns) if columns else None)
+
+
+def _load_history_file(path: str, columns: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+    """캐시를 거쳐 히스토리 파일을 읽고 복사본 반환"""
+    return _read_history_file(path, os.stat(path).st_mtime_ns, columns).copy()
+
+
+def _rank_partition_dir(history_dir: str, keyword: str, date_str: str = "") -> str:
+    """순위 파티션 경로 (hive 형식: ranks/keyword=.../date=...)"""
+    keyword_dir = os.path.join(history_dir, "ranks", f"keyword={keyword}")
+    return os.path.join(keyword_dir, f"date={date_str}") if date_str else keyword_dir
+
+
+def load_latest_ranks(keyword: str, history_dir: str = "history") -> Optional[pd.DataFrame]:
+    """
+    가장 최근 날짜 파티션의 (브랜드, 순위)만 로드 (compare_with_history 입력용)
+    
+    파티션 디렉터리 이름만 보고 최신 날짜를 고르므로 히스토리가 쌓여도 비용이 일정함.
+    순위 파티션이 없으면 (이전 버전 히스토리) 전체 스냅샷에서 읽음.
+    """
+    keyword_dir = _rank_partition_dir(history_dir, keyword)
+    dates = []
+    if os.path.isdir(keyword_dir):
+        dates = [name for name in os.listdir(keyword_dir) if name.startswith("date=")]
+    
+    if not dates:
+        df = load_latest_history(keyword, history_dir)
+        return df[list(HISTORY_RANK_COLUMNS)] if df is not None else None
+    
+    latest = os.path.join(keyword_dir, max(dates))
+    try:
+        df = _load_history_file(os.path.join(latest, "part-0.parquet"), HISTORY_RANK_COLUMNS)
+        print(f"📂 이전 순위 로드: {latest}")
+        return df
+    except Exception as e:
+        print(f"⚠️ 히스토리 로드 실패: {str(e)}")
+        return None
+
+
 def load_latest_history(keyword: str, history_dir: str = "history") -> Optional[pd.DataFrame]:
-    """가장 최근 히스토리 파일 로드"""
-    import os
+    """가장 최근 히스토리 파일 로드 (이전 버전의 CSV 히스토리도 읽음)"""
     import glob
     
     if not os.path.exists(history_dir):
         return None
     
-    pattern = f"{history_dir}/{keyword}_*.csv"
-    files = sorted(glob.glob(pattern), reverse=True)
+    # 파일명이 "{키워드}_{YYYYMMDD}.확장자"라 이름 역순 = 최신순 (같은 날짜면 parquet 우선)
+    files = sorted(
+        glob.glob(f"{history_dir}/{keyword}_*.parquet") + glob.glob(f"{history_dir}/{keyword}_*.csv"),
+        reverse=True
+    )
     
     if not files:
         return None
     
     try:
-        df = pd.read_csv(files[0], encoding="utf-8-sig")
+        df = _load_history_file(files[0])
         print(f"📂 이전 데이터 로드: {files[0]}")
         return df
     except Exception as e:
@@ -334,6 +534,46 @@ def analyze_top100(keyword: str, client_id: str, client_secret: str) -> Dict:
         max_items=100
     )
     
+    return _analyze_collected(keyword, current_df)
+
+
+def analyze_all(keywords: List[str], client_id: str, client_secret: str) -> Dict[str, Dict]:
+    """
+    여러 키워드의 TOP100 분석을 한번에 (API 수집은 동시에, 비교/저장은 키워드 순서대로)
+    
+    Args:
+        keywords: 분석할 키워드 리스트 (예: list(CATEGORIES))
+        client_id: 네이버 API Client ID
+        client_secret: 네이버 API Client Secret
+    
+    Returns:
+        {키워드: analyze_top100 결과와 같은 dict}
+    """
+    # 네트워크 대기가 대부분이라 스레드로 수집 요청을 겹쳐서 실행
+    with ThreadPoolExecutor(max_workers=TOP100_MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                crawl_shopping_top100,
+                client_id=client_id,
+                client_secret=client_secret,
+                keyword=keyword,
+                max_items=100
+            )
+            for keyword in keywords
+        ]
+    
+    results = {}
+    for keyword, future in zip(keywords, futures):
+        print("=" * 60)
+        print(f"🔍 '{keyword}' TOP100 분석 시작")
+        print("=" * 60)
+        results[keyword] = _analyze_collected(keyword, future.result())
+    
+    return results
+
+
+def _analyze_collected(keyword: str, current_df: pd.DataFrame) -> Dict:
+    """수집된 TOP100으로 히스토리 비교 + 급상승 감지 + 저장 (analyze_top100의 2~6단계)"""
     if current_df.empty:
         return {
             "current": current_df,
@@ -342,7 +582,7 @@ def analyze_top100(keyword: str, client_id: str, client_secret: str) -> Dict:
         }
     
     # 2. 이전 히스토리 로드
-    history_df = load_latest_history(keyword)
+    history_df = load_latest_ranks(keyword)
     
     # 3. 순위 변동 계산
     current_df = compare_with_history(current_df, history_df)
@@ -350,17 +590,23 @@ def analyze_top100(keyword: str, client_id: str, client_secret: str) -> Dict:
     # 4. 급상승 브랜드 감지
     rising_df = find_rising_brands(current_df, history_df, min_rise=10)
     
+    # 표시용 순위변동 문자열은 필터링이 끝난 뒤에 한 번만 생성
+    current_df["순위변동"] = format_rank_change(current_df)
+    rising_df["순위변동"] = format_rank_change(rising_df)
+    
     # 5. 현재 데이터를 히스토리로 저장
     save_history(current_df, keyword)
     
-    # 6. 요약 통계
+    # 6. 요약 통계 (평균은 한 번에 계산)
+    means = current_df[["가격", "리뷰수", "평점"]].mean()
+    is_new = current_df["상태코드"] == RANK_NEW
     summary = {
         "수집_제품수": len(current_df),
-        "신규_진입": len(current_df[current_df["순위변동"].str.contains("NEW", na=False)]),
+        "신규_진입": int(is_new.sum()),
         "급상승_10위이상": len(rising_df),
-        "평균_가격": int(current_df["가격"].mean()),
-        "평균_리뷰수": int(current_df["리뷰수"].mean()),
-        "평균_평점": round(current_df["평점"].mean(), 2),
+        "평균_가격": int(means["가격"]),
+        "평균_리뷰수": int(means["리뷰수"]),
+        "평균_평점": round(float(means["평점"]), 2),
         "수집_시간": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
     
@@ -381,8 +627,6 @@ def analyze_top100(keyword: str, client_id: str, client_secret: str) -> Dict:
 
 if __name__ == "__main__":
     # 테스트 실행
-    import os
-    
     CLIENT_ID = os.getenv("NAVER_CLIENT_ID", "9LKTOG5R9F8Yx74PnZe0")
     CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET", "gytCGuuEeX")
     
@@ -5,16 +5,28 @@
 - 실시간 트렌드 분석
 """
 
+import hashlib
+import html
+import io
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import json
+import traceback
 from pathlib import Path
+from typing import Dict
+from urllib.parse import quote
 
 # 로컬 모듈
-from datalab_api import find_rising_keywords, get_keyword_timeline
+from datalab_api import (
+    datalab_keyword_trend,
+    find_rising_keywords,
+    get_keyword_timeline,
+    get_keyword_timelines_batched
+)
 from naver_shopping_categories import (
     NAVER_SHOPPING_CATEGORIES,
     get_category_keywords,
@@ -22,6 +34,14 @@ from naver_shopping_categories import (
 )
 from category_manager import CategoryManager
 
+# 키워드 자동 발견 모듈 (앱 시작 시 한 번만 import, 실패하면 버튼을 눌렀을 때 오류 표시)
+try:
+    from auto_keyword_discovery import discover_trending_keywords_hierarchical, SEED_QUERIES
+    _DISCOVERY_IMPORT_ERROR = None
+except Exception as e:
+    discover_trending_keywords_hierarchical = SEED_QUERIES = None
+    _DISCOVERY_IMPORT_ERROR = e
+
 
 def test_api_connection(client_id: str, client_secret: str) -> bool:
     """
@@ -34,22 +54,19 @@ def test_api_connection(client_id: str, client_secret: str) -> bool:
     Returns:
         bool: API 키가 유효하면 True, 아니면 False
     """
-    from datetime import datetime, timedelta
-    
     try:
         # 간단한 테스트: 최근 7일, 단일 키워드
         end_date = datetime.now() - timedelta(days=1)
         start_date = end_date - timedelta(days=7)
         
-        from datalab_api import datalab_keyword_trend
-        
         result = datalab_keyword_trend(
             client_id=client_id,
             client_secret=client_secret,
             keywords=["비타민"],  # 테스트용 간단한 키워드
             start_date=start_date.strftime("%Y-%m-%d"),
             end_date=end_date.strftime("%Y-%m-%d"),
-            time_unit="date"
+            time_unit="date",
+            use_cache=False  # 캐시된 응답으로 인증이 통과되지 않도록 항상 실제 호출
         )
         
         # 정상 응답이면 True
@@ -60,31 +77,350 @@ def test_api_connection(client_id: str, client_secret: str) -> bool:
         return False
 
 
-def calculate_rising_score(is_new: bool, rank_delta, trend_delta: float, trend_pct: float) -> float:
+def calculate_rising_score(is_new, rank_delta, trend_delta, trend_pct):
     """
     급상승 스코어 계산
     
+    스칼라와 배열(Series/ndarray) 모두 받을 수 있어 DataFrame 열 전체를 한 번에 계산 가능.
+    
     Args:
         is_new: 신규 진입 여부
-        rank_delta: 순위 변화
+        rank_delta: 순위 변화 (None이면 반영 안 함)
         trend_delta: 검색량 절대 변화
         trend_pct: 검색량 변화율(%)
     
     Returns:
-        float: 급상승 스코어
+        급상승 스코어 (스칼라 입력이면 float, 배열 입력이면 ndarray)
     """
-    score = 0.0
+    score = np.where(is_new, 100.0, 0.0)
     
-    if is_new:
-        score += 100
+    if rank_delta is not None:
+        rank_delta = np.asarray(rank_delta, dtype=float)
+        score = score + np.where(rank_delta < 0, -rank_delta * 2, 0.0)
+    
+    score = score + np.maximum(trend_pct, 0) * 0.5
+    score = score + np.maximum(trend_delta, 0) * 0.3
+    
+    return float(score) if np.ndim(score) == 0 else np.asarray(score)
+
+# 부분 재실행 데코레이터 (Streamlit 버전에 따라 이름이 다르고, 없으면 일반 함수로 실행)
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# DataLab 분석 결과 캐시 유지 시간 (초)
+ANALYSIS_CACHE_TTL = 3600
+
+# API 키 테스트 결과 캐시 유지 시간 (초)
+API_TEST_CACHE_TTL = 300
+
+
+class _EmptyResultError(Exception):
+    """
+    캐시 함수 안에서 빈 결과(API 실패 포함)를 알리는 예외
+    
+    st.cache_data는 예외가 발생한 호출을 저장하지 않으므로,
+    일시적인 실패가 TTL 동안 캐시되지 않도록 빈 결과 대신 이 예외를 발생시킴.
+    """
+
+
+def _credentials_key(client_id: str, client_secret: str) -> str:
+    """
+    API 키를 캐시 키로 쓰기 위한 짧은 해시 (원문 키가 캐시 키에 남지 않도록)
+    
+    키 저장 시 한 번 계산해 session_state["credentials_key"]에 보관하고 재사용.
+    """
+    return hashlib.blake2s(
+        f"{client_id}:{client_secret}".encode("utf-8"), digest_size=8
+    ).hexdigest()
+
+
+@st.cache_data(ttl=API_TEST_CACHE_TTL, show_spinner=False)
+def _cached_api_test(credentials_key: str, _client_id: str, _client_secret: str) -> bool:
+    """
+    API 키 테스트 결과 캐시 (같은 키로 연달아 눌러도 요청은 한 번만)
+    
+    성공한 결과만 캐시하며, 실패하면 _EmptyResultError 발생
+    """
+    if not test_api_connection(_client_id, _client_secret):
+        raise _EmptyResultError("API 연결 테스트 실패")
+    return True
+
+
+def _api_test_ok(credentials_key: str, client_id: str, client_secret: str) -> bool:
+    """캐시된 API 키 테스트 (실패는 캐시하지 않고 False 반환)"""
+    try:
+        return _cached_api_test(
+            credentials_key, _client_id=client_id, _client_secret=client_secret
+        )
+    except _EmptyResultError:
+        return False
+
+
+@st.cache_data(ttl=ANALYSIS_CACHE_TTL, show_spinner=False)
+def _cached_rising(
+    keywords: tuple,
+    start_date: str,
+    end_date: str,
+    topk: int,
+    credentials_key: str,
+    _client_id: str,
+    _client_secret: str
+) -> pd.DataFrame:
+    """
+    급상승 키워드 분석 결과 캐시 (위젯 조작으로 재실행될 때 API 재호출 방지)
     
-    if rank_delta is not None and rank_delta < 0:
-        score += abs(rank_delta) * 2
+    밑줄로 시작하는 인자는 Streamlit 캐시 키에서 제외되며,
+    API 키는 credentials_key(해시)로만 구분함.
+    결과가 비어 있으면(배치 실패 포함) 캐시하지 않도록 _EmptyResultError 발생.
+    """
+    df = find_rising_keywords(
+        client_id=_client_id,
+        client_secret=_client_secret,
+        keywords=list(keywords),
+        start_date=start_date,
+        end_date=end_date,
+        topk=topk
+    )
+    if df.empty:
+        raise _EmptyResultError("급상승 키워드 분석 결과 없음")
+    return df
+
+
+@st.cache_data(ttl=ANALYSIS_CACHE_TTL, show_spinner=False)
+def _load_compare_bundle(
+    keywords: tuple,
+    start_date: str,
+    end_date: str,
+    credentials_key: str,
+    _client_id: str,
+    _client_secret: str
+) -> Dict:
+    """
+    여러 키워드 비교용 타임라인 조회 + 인사이트/정규화/CSV 계산 캐시
     
-    score += max(0, trend_pct) * 0.5
-    score += max(0, trend_delta) * 0.3
+    Returns:
+        {
+            "timeline_df": 날짜별 키워드 검색량,
+            "normalized_df": 키워드별 0-100 정규화 검색량,
+            "max_keyword"/"max_value": 최고 검색량 키워드와 값,
+            "stable_keyword"/"stable_std": 표준편차가 가장 작은 키워드와 값,
+            "avg_keyword"/"avg_value": 평균 검색량이 가장 높은 키워드와 값,
+            "csv_bytes": 비교 데이터 CSV (UTF-8 BOM)
+        }
+    
+    Raises:
+        _EmptyResultError: 데이터가 없을 때 (실패 결과가 캐시되지 않도록)
+    """
+    timeline_df = get_keyword_timeline(
+        keywords=list(keywords),
+        start_date=start_date,
+        end_date=end_date,
+        client_id=_client_id,
+        client_secret=_client_secret
+    )
+    if timeline_df.empty:
+        raise _EmptyResultError("비교 타임라인 데이터 없음")
+    
+    # 검색량 지수(0~100)는 float32로 충분 (정규화·집계·차트 데이터 크기 절반)
+    timeline_df = timeline_df.astype(np.float32)
+    
+    # 키워드별 통계를 한 번에 집계 (정규화와 인사이트가 같은 결과를 함께 사용)
+    stats = timeline_df.agg(["min", "max", "std", "mean"])
+    min_values = stats.loc["min"]
+    max_values = stats.loc["max"]
+    std_values = stats.loc["std"]
+    avg_values = stats.loc["mean"]
+    
+    # 정규화 (각 키워드를 0-100 스케일로, 열 단위 min/max를 전체 프레임에 한 번에 적용)
+    spread = max_values - min_values
+    flat = ~(spread > 0)  # 값이 변하지 않는 키워드는 50으로 고정
+    normalized_df = timeline_df.sub(min_values).div(spread.where(~flat)).mul(100)
+    normalized_df.loc[:, flat] = 50
     
-    return score
+    return {
+        "timeline_df": timeline_df,
+        "normalized_df": normalized_df,
+        "max_keyword": max_values.idxmax(),
+        "max_value": max_values.max(),
+        "stable_keyword": std_values.idxmin(),
+        "stable_std": std_values.min(),
+        "avg_keyword": avg_values.idxmax(),
+        "avg_value": avg_values.max(),
+        "csv_bytes": _to_csv_bytes(timeline_df.reset_index())
+    }
+
+
+@st.cache_data(ttl=ANALYSIS_CACHE_TTL, show_spinner=False)
+def _cached_keyword_timelines(
+    keywords: tuple,
+    start_date: str,
+    end_date: str,
+    credentials_key: str,
+    _client_id: str,
+    _client_secret: str
+) -> Dict[str, pd.Series]:
+    """
+    상세 분석용 키워드별 타임라인 캐시 (5개씩 묶어서 조회)
+    
+    조회된 타임라인이 없으면 캐시하지 않도록 _EmptyResultError 발생
+    """
+    timelines = get_keyword_timelines_batched(
+        client_id=_client_id,
+        client_secret=_client_secret,
+        keywords=list(keywords),
+        start_date=start_date,
+        end_date=end_date
+    )
+    if not timelines:
+        raise _EmptyResultError("키워드 타임라인 데이터 없음")
+    return timelines
+
+
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """
+    DataFrame을 UTF-8 BOM CSV bytes로 변환 (Excel에서 한글이 깨지지 않도록)
+    
+    문자열을 만든 뒤 다시 인코딩하지 않고 바이트 버퍼에 바로 기록.
+    """
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, encoding="utf-8-sig")
+    return buffer.getvalue()
+
+
+@st.cache_data(ttl=ANALYSIS_CACHE_TTL, show_spinner=False)
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    """다운로드용 CSV 변환 캐시 (같은 DataFrame이면 재실행 시 다시 변환하지 않음)"""
+    return _to_csv_bytes(df)
+
+
+def clear_analysis_cache() -> None:
+    """DataLab 분석 결과 및 API 키 테스트 캐시 비우기 (API 키 변경 시)"""
+    _cached_api_test.clear()
+    _cached_rising.clear()
+    _load_compare_bundle.clear()
+    _cached_keyword_timelines.clear()
+
+
+# 재사용할 차트 Figure 최대 개수 (상세 분석 10개 + 변화율 차트 여유분)
+FIGURE_CACHE_ENTRIES = 32
+
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _build_change_bar(df_top: pd.DataFrame, category: str):
+    """검색량 변화율 Top 10 막대 차트 (같은 데이터면 재실행 시 Figure 재사용)"""
+    fig = px.bar(
+        df_top,
+        x="pct_change",
+        y="keyword",
+        orientation="h",
+        color="pct_change",
+        color_continuous_scale="Reds",
+        labels={"pct_change": "변화율 (%)", "keyword": "키워드"},
+        title=f"{category} 검색량 변화율 Top 10"
+    )
+    fig.update_layout(height=500, showlegend=False)
+    return fig
+
+
+# 상세 분석 선 차트 공통 레이아웃 (키워드마다 trace만 바꿔 끼움)
+_TIMELINE_LAYOUT = go.Layout(
+    title="검색량 추이",
+    xaxis_title="날짜",
+    yaxis_title="검색량",
+    height=250,
+    margin=dict(l=20, r=20, t=40, b=20)
+)
+
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _build_timeline_line(timeline_df: pd.DataFrame, keyword: str):
+    """
+    키워드 검색량 추이 선 차트 (같은 데이터면 재실행 시 Figure 재사용)
+    
+    plotly.express의 DataFrame 해석 단계 없이 go.Scatter를 바로 구성.
+    """
+    return go.Figure(
+        data=[go.Scatter(
+            x=timeline_df.index.to_numpy(),
+            y=timeline_df[keyword].to_numpy(),
+            name=keyword,
+            mode="lines",
+            line=dict(color="#03C75A", width=2)
+        )],
+        layout=_TIMELINE_LAYOUT
+    )
+
+# 키워드 비교 선 차트 공통 레이아웃 (범례는 차트 위 가로 배치)
+_COMPARE_LAYOUT = dict(
+    hovermode="x unified",
+    height=500,
+    legend=dict(
+        title_text="",
+        orientation="h",
+        yanchor="bottom",
+        y=1.02,
+        xanchor="right",
+        x=1
+    )
+)
+
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _build_compare_figures(timeline_df: pd.DataFrame, normalized_df: pd.DataFrame) -> tuple:
+    """
+    키워드 비교 탭의 세 차트를 한 번만 생성 (탭 전환 등 재실행 시 Figure 재사용)
+    
+    Returns:
+        (시계열 비교, 히트맵, 정규화 비교) Figure
+    """
+    colors = px.colors.qualitative.Set2
+    
+    # 멀티 라인 차트 (wide format 그대로 전달해 trace를 한 번에 생성)
+    fig_line = px.line(
+        timeline_df,
+        y=list(timeline_df.columns),
+        color_discrete_sequence=colors,
+        labels={"date": "날짜", "value": "검색량 지수", "variable": "키워드"}
+    )
+    fig_line.update_traces(mode="lines+markers", line_width=2, marker_size=4)
+    fig_line.update_layout(
+        title=f"급상승 Top {len(timeline_df.columns)} 키워드 검색량 비교",
+        xaxis_title="날짜",
+        yaxis_title="검색량 지수",
+        **_COMPARE_LAYOUT
+    )
+    
+    # 히트맵 날짜 라벨 (인덱스가 이미 datetime이므로 포맷만 변경, 프레임 복사 없이 정렬 순서 유지)
+    date_labels = timeline_df.index.strftime('%m/%d').to_numpy()
+    
+    fig_heatmap = px.imshow(
+        timeline_df.to_numpy().T,
+        labels=dict(x="날짜", y="키워드", color="검색량"),
+        x=date_labels,
+        y=list(timeline_df.columns),
+        color_continuous_scale="YlOrRd",
+        aspect="auto"
+    )
+    fig_heatmap.update_layout(
+        title=f"급상승 키워드 검색량 히트맵",
+        height=400
+    )
+    
+    fig_normalized = px.line(
+        normalized_df,
+        y=list(normalized_df.columns),
+        color_discrete_sequence=colors,
+        labels={"date": "날짜", "value": "정규화 점수", "variable": "키워드"}
+    )
+    fig_normalized.update_traces(line_width=2)
+    fig_normalized.update_layout(
+        title=f"정규화된 트렌드 패턴 비교",
+        xaxis_title="날짜",
+        yaxis_title="정규화 점수 (0-100)",
+        **_COMPARE_LAYOUT
+    )
+    
+    return fig_line, fig_heatmap, fig_normalized
+
 
 # 페이지 설정
 st.set_page_config(
@@ -164,42 +500,150 @@ st.markdown("""
 def render_rising_keyword_card(rank: int, keyword: str, is_new: bool, 
                                  rank_delta: int, score: float, 
                                  trend_pct: float, avg_value: float):
-    """실시간 급상승 스타일 카드 (Streamlit 네이티브 컴포넌트 사용)"""
+    """실시간 급상승 스타일 카드 (카드 하나를 HTML 한 덩어리로 렌더링)"""
     
-    # 컨테이너로 카드 스타일 구현
-    with st.container():
-        # 순위와 키워드를 한 줄에
-        col1, col2, col3 = st.columns([0.5, 3, 1])
-        
-        with col1:
-            st.markdown(f"<h2 style='color: #03C75A; margin: 0;'>{rank}</h2>", 
-                       unsafe_allow_html=True)
-        
-        with col2:
-            badge_text = ""
-            if is_new:
-                badge_text = "🆕 NEW"
-            elif rank_delta < 0:
-                badge_text = f"🔺 {abs(rank_delta)}"
+    # 배지 (신규 진입 / 순위 상승)
+    badge_html = ""
+    if is_new:
+        badge_html = '<span class="rising-badge-new">🆕 NEW</span>'
+    elif rank_delta < 0:
+        badge_html = f'<span class="rising-badge-up">🔺 {abs(rank_delta)}</span>'
+    
+    score_html = ""
+    if score > 0:
+        score_html = f'<span class="rising-badge-up" style="float: right;">점수 {score:.0f}</span>'
+    
+    # 통계 정보
+    stats_parts = []
+    if trend_pct > 0:
+        stats_parts.append(f"📈 검색량 {trend_pct:+.1f}%")
+    if avg_value > 0:
+        stats_parts.append(f"⭐ 평균 {avg_value:.1f}")
+    stats_html = f'<div class="rising-stat">{" | ".join(stats_parts)}</div>' if stats_parts else ""
+    
+    # 위젯 여러 개 대신 markdown 한 번으로 전송
+    st.markdown(
+        f'<div class="rising-card">'
+        f'<span class="rising-rank">{rank}</span>'
+        f'<span class="rising-keyword">{html.escape(keyword)}</span>'
+        f'{badge_html}{score_html}{stats_html}'
+        f'</div>',
+        unsafe_allow_html=True
+    )
+
+
+@_fragment
+def render_compare_section(
+    df_rising: pd.DataFrame,
+    params: Dict,
+    category: str,
+    client_id: str,
+    client_secret: str,
+    credentials_key: str
+):
+    """
+    급상승 키워드 트렌드 비교 영역
+    
+    fragment로 실행되므로 이 안의 슬라이더·버튼 조작은 앱 전체가 아니라
+    이 영역만 다시 실행함.
+    """
+    # 비교할 키워드 수 선택
+    col_setting1, col_setting2 = st.columns([3, 1])
+
+    with col_setting1:
+        compare_count = st.slider(
+            "비교할 키워드 수",
+            min_value=3,
+            max_value=min(10, len(df_rising)),
+            value=min(5, len(df_rising)),
+            help="상위 N개 급상승 키워드의 검색량 추이를 비교합니다"
+        )
+
+    with col_setting2:
+        if st.button("🔄 차트 생성", type="primary", use_container_width=True):
+            # 버튼을 눌렀을 때의 키워드만 기억 (슬라이더만 움직여서는 다시 조회하지 않음)
+            st.session_state["compare_keywords"] = tuple(df_rising.head(compare_count)["keyword"])
+
+    # 차트 생성
+    top_keywords = st.session_state.get("compare_keywords")
+    if top_keywords:
+        with st.spinner(f"상위 {len(top_keywords)}개 키워드 데이터 로딩 중..."):
+            try:
+                # 타임라인 조회 및 파생 데이터 계산 (같은 조건이면 캐시 사용)
+                try:
+                    bundle = _load_compare_bundle(
+                        top_keywords,
+                        params["start_date"],
+                        params["end_date"],
+                        credentials_key,
+                        _client_id=client_id,
+                        _client_secret=client_secret
+                    )
+                except _EmptyResultError:
+                    bundle = None  # 빈 결과는 캐시되지 않음 (다시 누르면 재조회)
             
-            st.markdown(f"<h4 style='margin: 0; padding-top: 5px;'>{keyword} {badge_text}</h4>", 
-                       unsafe_allow_html=True)
-        
-        with col3:
-            if score > 0:
-                st.metric("점수", f"{score:.0f}", delta=None, delta_color="off")
-        
-        # 통계 정보
-        stats_parts = []
-        if trend_pct > 0:
-            stats_parts.append(f"📈 검색량 {trend_pct:+.1f}%")
-        if avg_value > 0:
-            stats_parts.append(f"⭐ 평균 {avg_value:.1f}")
-        
-        if stats_parts:
-            st.caption(" | ".join(stats_parts))
+                if bundle is not None:
+                    # 세 차트는 한 번 만들어 두고 재사용
+                    fig_line, fig_heatmap, fig_normalized = _build_compare_figures(
+                        bundle["timeline_df"], bundle["normalized_df"]
+                    )
+                    
+                    # 선택한 차트만 브라우저로 전송 (st.tabs는 세 차트를 모두 보냄)
+                    view = st.radio(
+                        "차트 보기",
+                        ["📈 시계열 비교", "📊 히트맵", "📉 정규화 비교"],
+                        horizontal=True,
+                        label_visibility="collapsed",
+                        key="compare_view"
+                    )
+                    
+                    if view == "📈 시계열 비교":
+                        st.markdown("### 📈 시계열 트렌드 비교")
+                        st.caption("각 키워드의 검색량 추이를 직접 비교합니다")
+                        st.plotly_chart(fig_line, use_container_width=True)
+                    elif view == "📊 히트맵":
+                        st.markdown("### 📊 검색량 히트맵")
+                        st.caption("키워드별 검색량의 상대적 강도를 색상으로 표현합니다")
+                        st.plotly_chart(fig_heatmap, use_container_width=True)
+                    else:
+                        st.markdown("### 📉 정규화 트렌드 비교")
+                        st.caption("각 키워드의 검색량을 0-100 범위로 정규화하여 트렌드 패턴을 비교합니다")
+                        st.plotly_chart(fig_normalized, use_container_width=True)
+                
+                    # 인사이트
+                    st.markdown("### 💡 인사이트")
+                
+                    col_insight1, col_insight2, col_insight3 = st.columns(3)
+                
+                    with col_insight1:
+                        st.markdown("#### 🏆 최고 검색량")
+                        st.info(f"**{bundle['max_keyword']}**\n\n{bundle['max_value']:.1f}")
+                
+                    with col_insight2:
+                        st.markdown("#### 📈 가장 안정적")
+                        st.info(f"**{bundle['stable_keyword']}**\n\n표준편차 {bundle['stable_std']:.1f}")
+                
+                    with col_insight3:
+                        st.markdown("#### 📊 평균 검색량")
+                        st.info(f"**{bundle['avg_keyword']}**\n\n{bundle['avg_value']:.1f}")
+                
+                    # 데이터 다운로드
+                    with st.expander("📋 비교 데이터 다운로드"):
+                        st.download_button(
+                            label="📥 비교 데이터 CSV 다운로드",
+                            data=bundle["csv_bytes"],
+                            file_name=f"compare_keywords_{category}_{datetime.now().strftime('%Y%m%d')}.csv",
+                            mime="text/csv"
+                        )
+            
+                else:
+                    st.warning("⚠️ 비교 데이터를 불러올 수 없습니다.")
         
-        st.divider()
+            except Exception as e:
+                st.error(f"❌ 비교 차트 생성 실패: {str(e)}")
+                with st.expander("🔧 상세 오류"):
+                    st.code(traceback.format_exc())
+
 
 
 def main():
@@ -248,6 +692,7 @@ def main():
                 if client_id_input and client_secret_input:
                     st.session_state["client_id"] = client_id_input
                     st.session_state["client_secret"] = client_secret_input
+                    st.session_state["credentials_key"] = _credentials_key(client_id_input, client_secret_input)
                     st.session_state["api_keys_saved"] = True
                     st.success("✅ API 키가 저장되었습니다!")
                     st.rerun()
@@ -262,6 +707,7 @@ def main():
             # API 키 변경 버튼
             if st.button("🔄 API 키 변경", use_container_width=True):
                 st.session_state["api_keys_saved"] = False
+                clear_analysis_cache()
                 st.rerun()
         else:
             st.warning("⚠️ API 키를 입력하세요")
@@ -269,6 +715,8 @@ def main():
         # API 키 가져오기
         client_id = st.session_state.get("client_id", "")
         client_secret = st.session_state.get("client_secret", "")
+        # 캐시 키용 해시 (저장 시 계산해 둔 값 재사용)
+        credentials_key = st.session_state.get("credentials_key") or _credentials_key(client_id, client_secret)
         
         st.divider()
         
@@ -312,11 +760,9 @@ def main():
                         help="대분류와 중분류별로 키워드를 자동으로 수집합니다"):
                 
                 try:
-                    # auto_keyword_discovery 모듈 import
-                    from auto_keyword_discovery import (
-                        discover_trending_keywords_hierarchical,
-                        SEED_QUERIES
-                    )
+                    # auto_keyword_discovery 모듈 import 실패 시 아래 오류 처리로 전달
+                    if _DISCOVERY_IMPORT_ERROR is not None:
+                        raise _DISCOVERY_IMPORT_ERROR
                     
                     # 프로그레스 바 생성
                     st.markdown("### 🔍 키워드 수집 중...")
@@ -345,9 +791,7 @@ def main():
                     progress_bar.progress(1.0)
                     status_text.text("✅ 수집 완료!")
                     
-                    # CategoryManager 새로고침 (파일에서 다시 로드)
-                    st.session_state["category_manager"] = CategoryManager()
-                    manager = st.session_state["category_manager"]
+                    # 수집 결과는 전달한 manager에 이미 반영·저장됨 (파일에서 다시 로드할 필요 없음)
                     stats = manager.get_stats()
                     
                     st.success(f"""
@@ -367,7 +811,6 @@ def main():
                     
                     # 상세 오류
                     with st.expander("🔧 상세 오류"):
-                        import traceback
                         st.code(traceback.format_exc())
         
         st.divider()
@@ -460,6 +903,9 @@ def main():
     with col3:
         # 키워드 통계
         keywords_info = manager.get_all_keywords(selected_major, selected_sub)
+        # 탭에서 반복되는 멤버십 확인용 (리스트 순회 대신 해시 조회)
+        enabled_set = frozenset(keywords_info["enabled"])
+        user_set = frozenset(keywords_info["user"])
         enabled_count = len(keywords_info["enabled"])
         total_count = len(keywords_info["auto"]) + len(keywords_info["user"])
         
@@ -521,7 +967,6 @@ def main():
         st.markdown("#### 전체 키워드 목록")
         
         all_keywords = keywords_info["auto"] + keywords_info["user"]
-        enabled_keywords = set(keywords_info["enabled"])
         
         if all_keywords:
             # 검색 필터 및 전체 선택/해제 버튼
@@ -560,36 +1005,56 @@ def main():
                     else:
                         st.error("❌ 최신 버전으로 업데이트가 필요합니다. 페이지를 새로고침하세요.")
             
+            # 정렬 + 소문자 변환은 키워드가 바뀔 때만 (검색어 입력마다 반복하지 않도록)
+            sort_key = (id(manager), manager.version, selected_major, selected_sub)
+            if st.session_state.get("sorted_keywords_key") != sort_key:
+                st.session_state["sorted_keywords"] = [(kw, kw.lower()) for kw in sorted(all_keywords)]
+                st.session_state["sorted_keywords_key"] = sort_key
+            
             if search_term:
-                all_keywords = [kw for kw in all_keywords if search_term.lower() in kw.lower()]
+                search_lower = search_term.lower()
+                sorted_keywords = [kw for kw, kw_lower in st.session_state["sorted_keywords"] if search_lower in kw_lower]
+            else:
+                sorted_keywords = [kw for kw, _ in st.session_state["sorted_keywords"]]
             
             # 통계 정보 더 명확하게 표시
             total_kw_count = len(keywords_info["auto"]) + len(keywords_info["user"])
-            enabled_count = len(enabled_keywords)
+            enabled_count = len(enabled_set)
             st.caption(f"💡 총 {total_kw_count}개 키워드 보유 | 활성화: {enabled_count}개 | 비활성화: {total_kw_count - enabled_count}개")
             
-            # 키워드 목록 (체크박스로 활성화/비활성화)
-            cols = st.columns(4)
-            for idx, keyword in enumerate(sorted(all_keywords)):
-                with cols[idx % 4]:
-                    is_enabled = keyword in enabled_keywords
-                    is_user = keyword in keywords_info["user"]
-                    
-                    # 체크박스
-                    new_state = st.checkbox(
-                        f"{'👤' if is_user else '🤖'} {keyword}",
-                        value=is_enabled,
-                        key=f"kw_{idx}_{keyword}",
-                        help="👤=사용자 지정, 🤖=자동 수집"
-                    )
-                    
-                    # 상태 변경 시 업데이트
-                    if new_state != is_enabled:
+            # 키워드 목록 (표 하나의 체크박스 열로 활성화/비활성화)
+            edit_df = pd.DataFrame({
+                "enabled": [kw in enabled_set for kw in sorted_keywords],
+                "type": ["👤" if kw in user_set else "🤖" for kw in sorted_keywords],
+                "keyword": sorted_keywords
+            })
+            
+            # 변경을 반영할 때마다 편집 상태를 새로 시작하도록 키에 리비전 포함
+            editor_rev = st.session_state.get("keyword_editor_rev", 0)
+            edited_df = st.data_editor(
+                edit_df,
+                column_config={
+                    "enabled": st.column_config.CheckboxColumn("활성화"),
+                    "type": st.column_config.TextColumn("구분", help="👤=사용자 지정, 🤖=자동 수집"),
+                    "keyword": st.column_config.TextColumn("키워드")
+                },
+                disabled=["type", "keyword"],
+                hide_index=True,
+                use_container_width=True,
+                key=f"kw_editor_{selected_major}_{selected_sub}_{search_term}_{editor_rev}"
+            )
+            
+            # 바뀐 행만 반영하고 저장은 한 번만
+            changed = edited_df[edit_df["enabled"].ne(edited_df["enabled"])]
+            if not changed.empty:
+                with manager.batch():
+                    for keyword, new_state in zip(changed["keyword"], changed["enabled"]):
                         if new_state:
                             manager.enable_keyword(selected_major, keyword, selected_sub)
                         else:
                             manager.disable_keyword(selected_major, keyword, selected_sub)
-                        st.rerun()
+                st.session_state["keyword_editor_rev"] = editor_rev + 1
+                st.rerun()
         else:
             st.info("키워드가 없습니다. 자동 수집을 실행하거나 사용자 지정 키워드를 추가하세요.")
     
@@ -602,12 +1067,14 @@ def main():
         st.caption(f"총 {len(auto_keywords)}개")
         
         if auto_keywords:
-            # 3열로 표시
+            # 3열로 표시 (열마다 markdown 한 번)
             cols = st.columns(3)
+            buckets = [[], [], []]
             for idx, kw in enumerate(auto_keywords):
-                is_enabled = kw in enabled_keywords
-                status = "✅" if is_enabled else "⬜"
-                cols[idx % 3].markdown(f"{status} {kw}")
+                status = "✅" if kw in enabled_set else "⬜"
+                buckets[idx % 3].append(f"{status} {kw}")
+            for col, lines in zip(cols, buckets):
+                col.markdown("\n\n".join(lines))
         else:
             st.info("자동 수집된 키워드가 없습니다.")
         
@@ -655,7 +1122,7 @@ def main():
                 col_kw, col_del = st.columns([4, 1])
                 
                 with col_kw:
-                    is_enabled = keyword in enabled_keywords
+                    is_enabled = keyword in enabled_set
                     status = "✅" if is_enabled else "⬜"
                     st.markdown(f"{status} {keyword}")
                 
@@ -693,8 +1160,8 @@ def main():
             st.error("❌ API 키를 입력하세요!")
             return
         
-        # 활성화된 키워드 가져오기
-        keywords = manager.get_enabled_keywords(selected_major, selected_sub)
+        # 활성화된 키워드 (위에서 조회한 keywords_info 재사용)
+        keywords = list(keywords_info["enabled"])
         
         if not keywords:
             category_name = f"{selected_major}" + (f" > {selected_sub}" if selected_sub else "")
@@ -722,14 +1189,19 @@ def main():
                 log_placeholder = st.empty()
                 log_placeholder.info("📋 터미널 로그를 확인하세요...")
                 
-                df_rising = find_rising_keywords(
-                    client_id=client_id,
-                    client_secret=client_secret,
-                    keywords=keywords,
-                    start_date=start_date_str,
-                    end_date=end_date_str,
-                    topk=topk
-                )
+                # 같은 조건의 분석은 캐시 사용 (키워드 순서가 배치 구성을 결정하므로 정렬하지 않음)
+                try:
+                    df_rising = _cached_rising(
+                        tuple(keywords),
+                        start_date_str,
+                        end_date_str,
+                        topk,
+                        credentials_key,
+                        _client_id=client_id,
+                        _client_secret=client_secret
+                    )
+                except _EmptyResultError:
+                    df_rising = pd.DataFrame()  # 빈 결과는 캐시되지 않음 (다음 분석 때 다시 조회)
                 
                 log_placeholder.empty()  # 로그 메시지 제거
                 
@@ -765,7 +1237,7 @@ def main():
                         
                         # API 키 테스트 버튼
                         if st.button("🧪 API 키 테스트", type="secondary"):
-                            test_result = test_api_connection(client_id, client_secret)
+                            test_result = _api_test_ok(credentials_key, client_id, client_secret)
                             if test_result:
                                 st.success("✅ API 키가 정상적으로 작동합니다!")
                             else:
@@ -773,22 +1245,21 @@ def main():
                     
                     return
                 
-                # 급상승 스코어 계산
-                df_rising["rising_score"] = df_rising.apply(
-                    lambda row: calculate_rising_score(
-                        is_new=False,
-                        rank_delta=None,
-                        trend_delta=row["abs_change"],
-                        trend_pct=row["pct_change"]
-                    ),
-                    axis=1
+                # 급상승 스코어 계산 (행 단위 apply 대신 열 전체를 한 번에)
+                df_rising["rising_score"] = calculate_rising_score(
+                    is_new=False,
+                    rank_delta=None,
+                    trend_delta=df_rising["abs_change"].to_numpy(),
+                    trend_pct=df_rising["pct_change"].to_numpy()
                 )
                 
-                df_rising = df_rising.sort_values("rising_score", ascending=False).head(topk)
+                # 상위 topk만 필요하므로 전체 정렬 대신 nlargest (순위 표시용 인덱스는 0부터 다시 부여)
+                df_rising = df_rising.nlargest(topk, "rising_score").reset_index(drop=True)
                 
                 # 세션에 저장
                 st.session_state["df_rising"] = df_rising
                 st.session_state["category"] = category_name
+                st.session_state.pop("compare_keywords", None)  # 이전 분석의 비교 차트는 닫음
                 st.session_state["analysis_params"] = {
                     "keywords": keywords,
                     "start_date": start_date_str,
@@ -799,7 +1270,6 @@ def main():
                 
             except Exception as e:
                 st.error(f"❌ 분석 실패: {str(e)}")
-                import traceback
                 with st.expander("🔧 상세 오류"):
                     st.code(traceback.format_exc())
                 return
@@ -821,6 +1291,20 @@ def main():
             
             # 표시할 개수 선택
             display_count = min(10, len(df_rising))
+            
+            # 상세 분석용 타임라인은 렌더링 전에 묶음 요청으로 한 번에 조회 (같은 조건이면 캐시 사용)
+            with st.spinner("상세 분석 데이터 로딩 중..."):
+                try:
+                    timelines = _cached_keyword_timelines(
+                        tuple(df_rising.head(display_count)["keyword"]),
+                        params["start_date"],
+                        params["end_date"],
+                        credentials_key,
+                        _client_id=client_id,
+                        _client_secret=client_secret
+                    )
+                except _EmptyResultError:
+                    timelines = {}  # 조회 실패는 캐시하지 않고 이번 화면에서만 데이터 없음으로 표시
         
             # 상위 N개 표시
             for idx, row in df_rising.head(display_count).iterrows():
@@ -841,46 +1325,32 @@ def main():
                 # 상세 분석 Expander (카드 안에서 토글)
                 with st.expander(f"🔍 '{keyword}' 상세 분석", expanded=False):
                     try:
-                        # 키워드 타임라인 가져오기
-                        timeline_df = get_keyword_timeline(
-                            keywords=[keyword],
-                            start_date=params["start_date"],
-                            end_date=params["end_date"],
-                            client_id=client_id,
-                            client_secret=client_secret
-                        )
+                        # 미리 조회해 둔 키워드 타임라인 사용
+                        timeline = timelines.get(keyword)
+                        timeline_df = timeline.to_frame() if timeline is not None else pd.DataFrame()
                     
                         if not timeline_df.empty:
                             # 컴팩트한 시계열 그래프
-                            fig = px.line(
-                                timeline_df.reset_index(),
-                                x="date",
-                                y=keyword,
-                                title=f"검색량 추이",
-                                labels={"date": "날짜", keyword: "검색량"}
-                            )
-                            fig.update_traces(line_color="#03C75A", line_width=2)
-                            fig.update_layout(height=250, margin=dict(l=20, r=20, t=40, b=20))
+                            fig = _build_timeline_line(timeline_df, keyword)
                             st.plotly_chart(fig, use_container_width=True)
                         
-                            # 통계 (컴팩트)
+                            # 통계 (컴팩트, 한 번에 집계)
+                            stats = timeline_df[keyword].agg(["mean", "max", "std"])
                             col_a, col_b, col_c = st.columns(3)
                             with col_a:
-                                st.metric("평균", f"{timeline_df[keyword].mean():.1f}", 
+                                st.metric("평균", f"{stats['mean']:.1f}", 
                                         delta=None, delta_color="off")
                             with col_b:
-                                st.metric("최대", f"{timeline_df[keyword].max():.1f}",
+                                st.metric("최대", f"{stats['max']:.1f}",
                                         delta=None, delta_color="off")
                             with col_c:
-                                st.metric("표준편차", f"{timeline_df[keyword].std():.1f}",
+                                st.metric("표준편차", f"{stats['std']:.1f}",
                                         delta=None, delta_color="off")
                             
                             # 참고 링크
                             st.markdown("---")
                             st.markdown("##### 🔗 참고 링크")
                             
-                            # URL 인코딩을 위한 import
-                            from urllib.parse import quote
                             encoded_keyword = quote(keyword)
                             
                             # 링크 버튼들을 2줄로 배치
@@ -930,50 +1400,52 @@ def main():
             # 나머지 키워드 (11위 이하)
             if len(df_rising) > display_count:
                 with st.expander(f"📋 {display_count+1}위 ~ {len(df_rising)}위 보기 ({len(df_rising)-display_count}개)"):
-                    for idx, row in df_rising.iloc[display_count:].iterrows():
-                        rank = idx + 1
-                        keyword = row['keyword']
+                    # 행마다 위젯을 만들지 않고 표 하나로 표시
+                    df_tail = df_rising.iloc[display_count:][
+                        ["keyword", "pct_change", "last_ratio", "rising_score"]
+                    ].assign(rank=lambda d: d.index + 1)
                     
-                        # 컴팩트한 표시
-                        col_rank, col_keyword, col_change = st.columns([1, 3, 2])
+                    # 시작 검색량이 0인 키워드는 변화율이 inf이므로 유한한 점수로만 막대 최대값 계산
+                    # (inf는 JSON으로 보낼 수 없어 표 설정이 깨짐)
+                    tail_scores = df_tail["rising_score"].to_numpy(dtype=float)
+                    tail_scores = tail_scores[np.isfinite(tail_scores)]
+                    tail_score_max = max(float(tail_scores.max()), 1.0) if tail_scores.size else 1.0
                     
-                        with col_rank:
-                            st.markdown(f"**{rank}위**")
-                        with col_keyword:
-                            st.markdown(f"**{keyword}**")
-                        with col_change:
-                            change_color = "🔴" if row['pct_change'] > 0 else "🔵"
-                            st.markdown(f"{change_color} {row['pct_change']:+.1f}%")
-                    
-                        # 간단한 정보 표시
-                        st.caption(f"검색량 평균: {row['last_ratio']:.1f} | 급상승 점수: {row['rising_score']:.1f}")
-                        st.markdown("---")
+                    st.dataframe(
+                        df_tail,
+                        column_order=["rank", "keyword", "pct_change", "last_ratio", "rising_score"],
+                        column_config={
+                            "rank": st.column_config.NumberColumn("순위", format="%d위"),
+                            "keyword": st.column_config.TextColumn("키워드"),
+                            "pct_change": st.column_config.NumberColumn("변화율", format="%+.1f%%"),
+                            "last_ratio": st.column_config.NumberColumn("검색량 평균", format="%.1f"),
+                            "rising_score": st.column_config.ProgressColumn(
+                                "급상승 점수",
+                                format="%.1f",
+                                min_value=0,
+                                max_value=tail_score_max
+                            )
+                        },
+                        hide_index=True,
+                        use_container_width=True
+                    )
     
         with col2:
             st.markdown("#### 📈 검색량 변화 상위")
         
             # 변화율 차트
-            fig = px.bar(
-                df_rising.head(10),
-                x="pct_change",
-                y="keyword",
-                orientation="h",
-                color="pct_change",
-                color_continuous_scale="Reds",
-                labels={"pct_change": "변화율 (%)", "keyword": "키워드"},
-                title=f"{category} 검색량 변화율 Top 10"
-            )
-            fig.update_layout(height=500, showlegend=False)
+            fig = _build_change_bar(df_rising.head(10)[["keyword", "pct_change"]], category)
             st.plotly_chart(fig, use_container_width=True)
         
             # 요약 통계
             st.markdown("#### 📊 요약 통계")
         
+            pct_stats = df_rising["pct_change"].agg(["mean", "max"])
             col_a, col_b, col_c = st.columns(3)
             with col_a:
-                st.metric("평균 증가율", f"{df_rising['pct_change'].mean():.1f}%")
+                st.metric("평균 증가율", f"{pct_stats['mean']:.1f}%")
             with col_b:
-                st.metric("최대 증가율", f"{df_rising['pct_change'].max():.1f}%")
+                st.metric("최대 증가율", f"{pct_stats['max']:.1f}%")
             with col_c:
                 st.metric("분석 키워드", f"{len(params['keywords'])}개")
     
@@ -981,194 +1453,20 @@ def main():
         st.markdown("---")
         st.markdown("## 📊 급상승 키워드 트렌드 비교")
     
-        # 비교할 키워드 수 선택
-        col_setting1, col_setting2 = st.columns([3, 1])
-    
-        with col_setting1:
-            compare_count = st.slider(
-                "비교할 키워드 수",
-                min_value=3,
-                max_value=min(10, len(df_rising)),
-                value=min(5, len(df_rising)),
-                help="상위 N개 급상승 키워드의 검색량 추이를 비교합니다"
-            )
-    
-        with col_setting2:
-            if st.button("🔄 차트 생성", type="primary", use_container_width=True):
-                st.session_state["generate_compare_chart"] = True
-    
-        # 차트 생성
-        if st.session_state.get("generate_compare_chart", False):
-            with st.spinner(f"상위 {compare_count}개 키워드 데이터 로딩 중..."):
-                try:
-                    # 상위 키워드 선택
-                    top_keywords = df_rising.head(compare_count)["keyword"].tolist()
-                
-                    # 타임라인 데이터 조회
-                    timeline_df = get_keyword_timeline(
-                        keywords=top_keywords,
-                        start_date=params["start_date"],
-                        end_date=params["end_date"],
-                        client_id=client_id,
-                        client_secret=client_secret
-                    )
-                
-                    if not timeline_df.empty:
-                        # 탭으로 여러 차트 제공
-                        tab1, tab2, tab3 = st.tabs(["📈 시계열 비교", "📊 히트맵", "📉 정규화 비교"])
-                    
-                        with tab1:
-                            st.markdown("### 📈 시계열 트렌드 비교")
-                            st.caption("각 키워드의 검색량 추이를 직접 비교합니다")
-                        
-                            # 멀티 라인 차트
-                            fig_line = go.Figure()
-                        
-                            colors = px.colors.qualitative.Set2
-                            for idx, keyword in enumerate(top_keywords):
-                                fig_line.add_trace(go.Scatter(
-                                    x=timeline_df.index,
-                                    y=timeline_df[keyword],
-                                    name=keyword,
-                                    mode='lines+markers',
-                                    line=dict(width=2, color=colors[idx % len(colors)]),
-                                    marker=dict(size=4)
-                                ))
-                        
-                            fig_line.update_layout(
-                                title=f"급상승 Top {compare_count} 키워드 검색량 비교",
-                                xaxis_title="날짜",
-                                yaxis_title="검색량 지수",
-                                hovermode='x unified',
-                                height=500,
-                                legend=dict(
-                                    orientation="h",
-                                    yanchor="bottom",
-                                    y=1.02,
-                                    xanchor="right",
-                                    x=1
-                                )
-                            )
-                        
-                            st.plotly_chart(fig_line, use_container_width=True)
-                    
-                        with tab2:
-                            st.markdown("### 📊 검색량 히트맵")
-                            st.caption("키워드별 검색량의 상대적 강도를 색상으로 표현합니다")
-                        
-                            # 히트맵 데이터 준비 (날짜를 짧게, 정렬 유지)
-                            heatmap_data = timeline_df.copy()
-                            # 인덱스가 이미 datetime이므로 포맷만 변경 (정렬 순서 유지)
-                            heatmap_data.index = heatmap_data.index.strftime('%m/%d')
-                        
-                            fig_heatmap = px.imshow(
-                                heatmap_data.T,
-                                labels=dict(x="날짜", y="키워드", color="검색량"),
-                                x=heatmap_data.index,
-                                y=top_keywords,
-                                color_continuous_scale="YlOrRd",
-                                aspect="auto"
-                            )
-                        
-                            fig_heatmap.update_layout(
-                                title=f"급상승 키워드 검색량 히트맵",
-                                height=400
-                            )
-                        
-                            st.plotly_chart(fig_heatmap, use_container_width=True)
-                    
-                        with tab3:
-                            st.markdown("### 📉 정규화 트렌드 비교")
-                            st.caption("각 키워드의 검색량을 0-100 범위로 정규화하여 트렌드 패턴을 비교합니다")
-                        
-                            # 정규화 (각 키워드를 0-100 스케일로)
-                            normalized_df = timeline_df.copy()
-                            for col in normalized_df.columns:
-                                min_val = normalized_df[col].min()
-                                max_val = normalized_df[col].max()
-                                if max_val > min_val:
-                                    normalized_df[col] = ((normalized_df[col] - min_val) / (max_val - min_val)) * 100
-                                else:
-                                    normalized_df[col] = 50
-                        
-                            fig_normalized = go.Figure()
-                        
-                            for idx, keyword in enumerate(top_keywords):
-                                fig_normalized.add_trace(go.Scatter(
-                                    x=normalized_df.index,
-                                    y=normalized_df[keyword],
-                                    name=keyword,
-                                    mode='lines',
-                                    line=dict(width=2, color=colors[idx % len(colors)])
-                                ))
-                        
-                            fig_normalized.update_layout(
-                                title=f"정규화된 트렌드 패턴 비교",
-                                xaxis_title="날짜",
-                                yaxis_title="정규화 점수 (0-100)",
-                                hovermode='x unified',
-                                height=500,
-                                legend=dict(
-                                    orientation="h",
-                                    yanchor="bottom",
-                                    y=1.02,
-                                    xanchor="right",
-                                    x=1
-                                )
-                            )
-                        
-                            st.plotly_chart(fig_normalized, use_container_width=True)
-                    
-                        # 인사이트
-                        st.markdown("### 💡 인사이트")
-                    
-                        col_insight1, col_insight2, col_insight3 = st.columns(3)
-                    
-                        with col_insight1:
-                            st.markdown("#### 🏆 최고 검색량")
-                            max_values = timeline_df.max()
-                            max_keyword = max_values.idxmax()
-                            max_value = max_values.max()
-                            st.info(f"**{max_keyword}**\n\n{max_value:.1f}")
-                    
-                        with col_insight2:
-                            st.markdown("#### 📈 가장 안정적")
-                            std_values = timeline_df.std()
-                            stable_keyword = std_values.idxmin()
-                            stable_std = std_values.min()
-                            st.info(f"**{stable_keyword}**\n\n표준편차 {stable_std:.1f}")
-                    
-                        with col_insight3:
-                            st.markdown("#### 📊 평균 검색량")
-                            avg_values = timeline_df.mean()
-                            avg_keyword = avg_values.idxmax()
-                            avg_value = avg_values.max()
-                            st.info(f"**{avg_keyword}**\n\n{avg_value:.1f}")
-                    
-                        # 데이터 다운로드
-                        with st.expander("📋 비교 데이터 다운로드"):
-                            csv_compare = timeline_df.reset_index().to_csv(index=False, encoding="utf-8-sig")
-                            st.download_button(
-                                label="📥 비교 데이터 CSV 다운로드",
-                                data=csv_compare,
-                                file_name=f"compare_keywords_{category}_{datetime.now().strftime('%Y%m%d')}.csv",
-                                mime="text/csv"
-                            )
-                
-                    else:
-                        st.warning("⚠️ 비교 데이터를 불러올 수 없습니다.")
-            
-                except Exception as e:
-                    st.error(f"❌ 비교 차트 생성 실패: {str(e)}")
-                    with st.expander("🔧 상세 오류"):
-                        import traceback
-                        st.code(traceback.format_exc())
+        render_compare_section(
+            df_rising=df_rising,
+            params=params,
+            category=category,
+            client_id=client_id,
+            client_secret=client_secret,
+            credentials_key=credentials_key
+        )
     
         # 데이터 다운로드
         st.markdown("---")
         st.markdown("### 💾 데이터 다운로드")
     
-        csv = df_rising.to_csv(index=False, encoding="utf-8-sig")
+        csv = _csv_bytes(df_rising)
         st.download_button(
             label="📥 CSV 다운로드",
             data=csv,